@@ -0,0 +1,63 @@
+"""
+Startup-time regression check.
+
+Imports each module in a fresh interpreter and fails if the import takes longer than
+the budget, or if it loads a provider SDK or PDF converter that should only be
+imported on first use:
+
+    python benchmarks/check_import_time.py --budget 1.5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ['crew', 'crew.utils']
+
+# Must not be imported just by importing the modules above
+LAZY_MODULES = ['langchain_openai', 'langchain_anthropic', 'langchain_google_genai', 'pdfkit', 'markdown', 'crewai']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {lazy!r} if m in sys.modules]}}))
+"""
+
+def measure(module, repeats):
+    timings = []
+    loaded = []
+    for _ in range(repeats):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, lazy=LAZY_MODULES)],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(probe['elapsed'])
+        loaded = probe['loaded']
+    # The fastest run is the least affected by disk cache and machine noise
+    return min(timings), loaded
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check import time of the crew package against a budget")
+    parser.add_argument("--budget", type=float, default=1.5, help="Maximum import time per module in seconds")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh interpreters per module")
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        elapsed, loaded = measure(module, args.repeats)
+        status = "ok"
+        if elapsed > args.budget:
+            status = f"over budget ({args.budget:.2f}s)"
+            failed = True
+        if loaded:
+            status = f"eagerly imports {', '.join(loaded)}"
+            failed = True
+        print(f"{module:<12} {elapsed:>7.3f}s  {status}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,248 @@
+"""
+Offline benchmarks for the job application pipeline.
+
+Uses the 'fake' LLM and embedding services plus stub scrape/search tools, so the
+numbers measure the pipeline's own overhead with a fixed, configurable provider
+latency. Results are written as JSON and can be compared between commits:
+
+    python benchmarks/run_benchmarks.py --output bench_before.json
+    python benchmarks/run_benchmarks.py --output bench_after.json --compare bench_before.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Type
+from pydantic import BaseModel, Field
+from crewai_tools import BaseTool
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import crew.agents
+import job_application_client
+from crew.agents import create_agents
+from crew.utils import post_process_latex, convert_ltx_to_pdf, convert_md_to_pdf
+
+SAMPLE_RESUME = os.path.join(REPO_ROOT, 'benchmarks', 'sample_resume.md')
+CLS_FILE = os.path.join(REPO_ROOT, 'crew', 'resume.cls')
+
+CANNED_POSTING = (
+    "Senior Backend Engineer. Requirements: 5+ years of Python or Go, distributed systems, "
+    "Kafka, Kubernetes, PostgreSQL, experience mentoring engineers and owning production services."
+)
+
+CANNED_STRUCTURED_RESUME = {
+    "contact": {"full_name": "Jane Doe", "email": "jane.doe@example.com", "linkedin_profile": "janedoe",
+                "phone": "(555) 010-0199", "city": "San Francisco", "state": "CA"},
+    "education": [{"degree": "M.S.", "major": "Computer Science", "university": "Stanford University",
+                   "start_date": "2016", "end_date": "2018", "courses": ["Distributed Systems", "Databases"]}],
+    "skills": [{"skill_category": "Languages", "skills": ["Python", "Go", "SQL"]},
+               {"skill_category": "Infrastructure", "skills": ["Kafka", "Kubernetes", "PostgreSQL"]}],
+    "jobs": [{"job_title": "Senior Software Engineer", "company_name": "Acme Corp", "city": "San Francisco",
+              "state": "CA", "start_date": "2021", "end_date": "Present",
+              "achievements": ["Cut p99 latency of the **Kafka** ingestion pipeline from 1.2s to 180ms.",
+                               "Migrated 40 services to **Kubernetes**, lowering cost by 28%."]}],
+    "projects": [{"project_name": "Resume Tailoring Assistant",
+                  "descriptions": ["Built a multi-agent pipeline that tailors resumes to job postings."]}]
+}
+
+def final_answer(text):
+    return f"Thought: I now know the final answer\nFinal Answer: {text}"
+
+def benchmark_config(latency, cache_dir, structured_resume=True):
+    def fake_llm(response):
+        return {"service": "fake", "model": "fake", "latency": latency, "responses": [final_answer(response)]}
+
+    return {
+        "concurrent_tasks": True,
+        "structured_resume": structured_resume,
+        "api_keys": {"serper": "benchmark"},
+        "agent_llms": {
+            "job_analyzer": fake_llm("- Python or Go\n- Kafka\n- Kubernetes\n- PostgreSQL\n- Mentoring"),
+            "relevance_selector": fake_llm(open(SAMPLE_RESUME).read()),
+            "emphasis_strategist": fake_llm(json.dumps(CANNED_STRUCTURED_RESUME)),
+            "cover_letter_writer": fake_llm("Dear Hiring Manager,\n\nI am excited to apply.\n\nSincerely,\nJane Doe"),
+        },
+        "resume_index": {"enabled": True, "dir": os.path.join(cache_dir, "resume_index"),
+                         "embedding": {"service": "fake", "model": "256"}},
+        "tool_cache": {"enabled": False},
+        "llm_cache": {"enabled": False},
+        "tracing": {"enabled": False},
+    }
+
+class StubScrapeToolSchema(BaseModel):
+    website_url: str = Field(..., description="Mandatory website url to read the file")
+
+class StubScrapeTool(BaseTool):
+    name: str = "Read website content"
+    description: str = "A tool that can be used to read a website content."
+    args_schema: Type[BaseModel] = StubScrapeToolSchema
+    latency: float = 0.0
+
+    def _run(self, **kwargs: Any) -> Any:
+        time.sleep(self.latency)
+        return CANNED_POSTING
+
+class StubSearchToolSchema(BaseModel):
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
+
+class StubSearchTool(BaseTool):
+    name: str = "Search the internet"
+    description: str = "A tool that can be used to search the internet with a search_query."
+    args_schema: Type[BaseModel] = StubSearchToolSchema
+    latency: float = 0.0
+
+    def _run(self, **kwargs: Any) -> Any:
+        time.sleep(self.latency)
+        return "Title: Senior Backend Engineer\nLink: https://example.com/jobs/1\nSnippet: " + CANNED_POSTING
+
+def install_stub_tools(latency):
+    # create_agents looks up create_web_tools on its own module, so swapping it there is enough
+    crew.agents.create_web_tools = lambda config: (StubSearchTool(latency=latency), StubScrapeTool(latency=latency))
+
+def timed(fn, runs):
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return {
+        "runs": runs,
+        "mean": statistics.mean(durations),
+        "median": statistics.median(durations),
+        "min": min(durations),
+        "max": max(durations),
+    }
+
+def large_latex_document(items):
+    bullets = "\n".join(
+        rf"\item Improved \textbf[throughput] by {i}\% using \href[https://example.com/{i}][caching] [[achievement_end]]"
+        for i in range(items)
+    )
+    return (
+        "\\documentclass[resume]\n\\usepackage[enumitem]\n\\name\\Large Jane Doe\n\\begin[document]\n"
+        f"\\begin[rSection]EXPERIENCE\n\\begin[itemize]\n{bullets}\n\\end[itemize]\n\\end[rSection]\n\\end[document]\n"
+    )
+
+def run_benchmarks(args):
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix='job_app_bench_')
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    try:
+        config = benchmark_config(args.latency, os.path.join(work_dir, '.cache'))
+        config_path = os.path.join(work_dir, 'config.json')
+        with open(config_path, 'w') as f:
+            json.dump(config, f)
+        install_stub_tools(args.tool_latency)
+
+        print("Benchmarking create_agents...")
+        results['create_agents'] = timed(lambda: create_agents(SAMPLE_RESUME, config), args.runs)
+
+        print("Benchmarking full pipeline...")
+        results['pipeline'] = timed(
+            lambda: job_application_client.run_job(
+                SAMPLE_RESUME, config, 'https://example.com/jobs/1', CANNED_POSTING, output_dir=os.path.join(work_dir, 'single')
+            ),
+            args.runs
+        )
+
+        print("Benchmarking post_process_latex...")
+        document = large_latex_document(args.latex_items)
+        results['post_process_latex'] = timed(lambda: post_process_latex(document), args.runs)
+
+        if shutil.which('pdflatex') and os.path.exists(CLS_FILE):
+            print("Benchmarking convert_ltx_to_pdf...")
+            with open('latex_resume.md', 'w') as f:
+                f.write("```latex\n" + large_latex_document(20) + "```\n")
+            results['convert_ltx_to_pdf'] = timed(
+                lambda: convert_ltx_to_pdf('latex_resume.md', CLS_FILE, output_pdf_name='resume.pdf'), args.runs
+            )
+        else:
+            print("Skipping convert_ltx_to_pdf (pdflatex or crew/resume.cls not found)")
+
+        if shutil.which('wkhtmltopdf'):
+            print("Benchmarking convert_md_to_pdf...")
+            shutil.copy(SAMPLE_RESUME, 'cover_letter.md')
+            results['convert_md_to_pdf'] = timed(lambda: convert_md_to_pdf(['cover_letter.md']), args.runs)
+        else:
+            print("Skipping convert_md_to_pdf (wkhtmltopdf not found)")
+
+        manifest_path = os.path.join(work_dir, 'manifest.jsonl')
+        for concurrency in args.concurrency:
+            print(f"Benchmarking batch throughput at concurrency {concurrency}...")
+            with open(manifest_path, 'w') as f:
+                for i in range(args.jobs):
+                    f.write(json.dumps({
+                        "url": f"https://example.com/jobs/{i}",
+                        "description": CANNED_POSTING,
+                        "output_dir": os.path.join(work_dir, f"batch_{concurrency}", f"job_{i}")
+                    }) + "\n")
+            start = time.perf_counter()
+            summaries = job_application_client.run_batch(SAMPLE_RESUME, config_path, manifest_path, concurrency=concurrency)
+            elapsed = time.perf_counter() - start
+            results[f'batch_concurrency_{concurrency}'] = {
+                "jobs": args.jobs,
+                "failed": sum(1 for summary in summaries if summary['status'] != 'ok'),
+                "wall_time": elapsed,
+                "jobs_per_second": args.jobs / elapsed,
+            }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_comparison(previous, current):
+    print(f"\nComparison with {previous.get('commit') or 'previous run'}:")
+    print(f"{'Benchmark':<28} {'Before':>10} {'After':>10} {'Change':>8}")
+    for name, result in current['results'].items():
+        metric = 'mean' if 'mean' in result else 'wall_time'
+        before = previous['results'].get(name, {}).get(metric)
+        after = result[metric]
+        if before:
+            print(f"{name:<28} {before:>10.4f} {after:>10.4f} {(after - before) / before:>+8.1%}")
+        else:
+            print(f"{name:<28} {'-':>10} {after:>10.4f} {'-':>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run offline pipeline benchmarks with stub LLMs and tools")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions per timed benchmark")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated latency of each fake LLM call in seconds")
+    parser.add_argument("--tool-latency", type=float, default=0.01, help="Simulated latency of each stub tool call in seconds")
+    parser.add_argument("--latex-items", type=int, default=5000, help="Bullet count of the post_process_latex input")
+    parser.add_argument("--jobs", type=int, default=8, help="Jobs per batch throughput benchmark")
+    parser.add_argument("--concurrency", type=lambda value: [int(v) for v in value.split(',')], default=[1, 2, 4, 8],
+                        help="Comma-separated batch concurrency levels")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "settings": {"latency": args.latency, "tool_latency": args.tool_latency, "runs": args.runs},
+        "results": run_benchmarks(args),
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(json.load(f), report)
@@ -1,3 +1,25 @@
-from .agents import create_agents
-from .tasks import create_tasks
-from .utils import load_config, get_llm, print_llm_assignments, convert_md_to_pdf, convert_ltx_to_pdf
\ No newline at end of file
+import importlib
+
+# Public names are resolved on first access so that `import crew` (or any crew
+# submodule) doesn't pull in crewai, the provider SDKs or the PDF converters.
+_EXPORTS = {
+    'create_agents': '.agents',
+    'create_tasks': '.tasks',
+    'load_config': '.utils',
+    'get_llm': '.utils',
+    'print_llm_assignments': '.utils',
+    'convert_md_to_pdf': '.utils',
+    'convert_md_to_pdfs': '.md_pdf',
+    'convert_ltx_to_pdf': '.utils',
+    'convert_json_to_pdf': '.utils',
+    'compile_latex_many': '.utils',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
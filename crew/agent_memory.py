@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Type
+import numpy as np
+from pydantic import BaseModel, Field
+from crewai_tools import BaseTool
+from .checkpoints import output_text
+from .resume_index import DEFAULT_EMBEDDING, get_embeddings, split_resume
+from .stores import connect, evict_lru, file_hash, get_shared, text_hash
+from .tracing import record, span
+
+DEFAULT_MEMORY_PATH = os.path.join(".cache", "agent_memory.sqlite")
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_AGE_DAYS = 90
+DEFAULT_TOP_K = 4
+MAX_CHUNKS_PER_OUTPUT = 8
+
+# Task outputs are embedded and written here so saving them doesn't hold up the crew
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='agent-memory')
+
+class AgentMemory:
+    """
+    SQLite store of notes from earlier runs, scoped per candidate (resume content hash)
+    and embedding model.
+
+    Each candidate keeps at most max_entries notes; the least recently used are evicted
+    first, and notes older than max_age_days are dropped.
+    """
+
+    def __init__(self, path=DEFAULT_MEMORY_PATH, embedding_config=None, max_entries=DEFAULT_MAX_ENTRIES, max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.embedding_config = embedding_config or DEFAULT_EMBEDDING
+        self.model = f"{self.embedding_config['service']}:{self.embedding_config['model']}"
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 24 * 60 * 60
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS notes ("
+            "scope TEXT, model TEXT, hash TEXT, agent TEXT, text TEXT, vector BLOB, "
+            "created_at REAL, last_access REAL, PRIMARY KEY (scope, model, hash))"
+        )
+        self._conn.commit()
+
+    def remember(self, scope, agent, text):
+        """
+        Splits text into chunks and stores the ones not already known for this candidate.
+        """
+        chunks = split_resume(text)[:MAX_CHUNKS_PER_OUTPUT]
+        with self._lock:
+            known = {
+                row[0] for row in self._conn.execute(
+                    "SELECT hash FROM notes WHERE scope = ? AND model = ?", (scope, self.model)
+                )
+            }
+        new_chunks = [(text_hash(chunk), chunk) for chunk in chunks if text_hash(chunk) not in known]
+        if not new_chunks:
+            return
+
+        with span('agent_memory_write', 'embedding', agent=agent, embedded_chunks=len(new_chunks)):
+            vectors = np.asarray(
+                get_embeddings(self.embedding_config).embed_documents([chunk for _, chunk in new_chunks]),
+                dtype=np.float32
+            )
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(scope, self.model, h, agent, chunk, vector.tobytes(), now, now) for (h, chunk), vector in zip(new_chunks, vectors)]
+            )
+            self._conn.execute("DELETE FROM notes WHERE created_at < ?", (now - self.max_age,))
+            evict_lru(self._conn, 'notes', self.max_entries, where="scope = ? AND model = ?", params=(scope, self.model))
+            self._conn.commit()
+
+    def search(self, scope, query, top_k=DEFAULT_TOP_K):
+        """
+        Returns up to top_k (agent, text, created_at) notes for this candidate, most similar first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT hash, agent, text, vector, created_at FROM notes "
+                "WHERE scope = ? AND model = ? AND created_at >= ?",
+                (scope, self.model, time.time() - self.max_age)
+            ).fetchall()
+        record('agent_memory_search', 'cache', cache_hit=bool(rows))
+        if not rows:
+            return []
+
+        vectors = np.stack([np.frombuffer(row[3], dtype=np.float32) for row in rows])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+        query_vector = np.asarray(get_embeddings(self.embedding_config).embed_query(query), dtype=np.float32)
+        query_vector = query_vector / (np.linalg.norm(query_vector) or 1)
+        best = [rows[i] for i in np.argsort(-(vectors @ query_vector))[:top_k]]
+
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE notes SET last_access = ? WHERE scope = ? AND model = ? AND hash = ?",
+                [(time.time(), scope, self.model, row[0]) for row in best]
+            )
+            self._conn.commit()
+        return [(row[1], row[2], row[4]) for row in best]
+
+def agent_memory_enabled(config, agent_name):
+    """
+    Whether agent_name uses memory: `agent_memory.enabled` must be true and the agent
+    not switched off in `agent_memory.agents`.
+    """
+    memory_config = config.get('agent_memory', {})
+    return memory_config.get('enabled', False) and memory_config.get('agents', {}).get(agent_name, True)
+
+def get_agent_memory(config):
+    memory_config = config.get('agent_memory', {})
+    embedding_config = memory_config.get('embedding') or config.get('resume_index', {}).get('embedding', DEFAULT_EMBEDDING)
+    path = memory_config.get('path', DEFAULT_MEMORY_PATH)
+
+    return get_shared('agent_memory', path, lambda: AgentMemory(
+        path,
+        embedding_config,
+        max_entries=memory_config.get('max_entries', DEFAULT_MAX_ENTRIES),
+        max_age_days=memory_config.get('max_age_days', DEFAULT_MAX_AGE_DAYS)
+    ))
+
+class MemorySearchToolSchema(BaseModel):
+    search_query: str = Field(..., description="What you want to recall about the candidate")
+
+class MemorySearchTool(BaseTool):
+    name: str = "Search notes from earlier runs"
+    description: str = (
+        "A tool that searches notes saved from earlier job applications for this candidate, "
+        "such as resume sections that were selected and how they were justified."
+    )
+    args_schema: Type[BaseModel] = MemorySearchToolSchema
+    memory: Any = None
+    scope: str = ""
+    top_k: int = DEFAULT_TOP_K
+
+    def _run(self, search_query: str, **kwargs: Any) -> Any:
+        notes = self.memory.search(self.scope, search_query, top_k=self.top_k)
+        if not notes:
+            return "No notes from earlier runs yet."
+        return "\n\n---\n\n".join(
+            f"From the {agent} on {time.strftime('%Y-%m-%d', time.localtime(created_at))}:\n{text}"
+            for agent, text, created_at in notes
+        )
+
+def create_memory_search_tool(resume_path, config):
+    memory_config = config.get('agent_memory', {})
+    return MemorySearchTool(
+        memory=get_agent_memory(config), scope=file_hash(resume_path),
+        top_k=memory_config.get('top_k', DEFAULT_TOP_K)
+    )
+
+def _report_write_error(future):
+    if future.exception() is not None:
+        print(f"Could not save agent memory: {future.exception()}")
+
+def attach_agent_memory(config, resume_path, tasks_by_agent):
+    """
+    Saves the output of each task whose agent has memory enabled to the candidate's
+    memory once the task finishes. tasks_by_agent maps agent config names (as in
+    `agent_llms`) to their tasks. Existing task callbacks still run.
+    """
+    scope = file_hash(resume_path)
+    for agent_name, task in tasks_by_agent.items():
+        if not agent_memory_enabled(config, agent_name):
+            continue
+        memory = get_agent_memory(config)
+
+        def save(output, previous=task.callback, role=task.agent.role, memory=memory):
+            if previous:
+                previous(output)
+            _writer.submit(memory.remember, scope, role, output_text(output)).add_done_callback(_report_write_error)
+
+        task.callback = save
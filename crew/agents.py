@@ -1,17 +1,36 @@
 import os
 from crewai import Agent
-from crewai_tools import SerperDevTool, ScrapeWebsiteTool, FileReadTool, MDXSearchTool
+from .agent_memory import agent_memory_enabled, create_memory_search_tool
+from .resume_index import create_resume_search_tool
+from .resume_sections import create_resume_read_tool
+from .tool_cache import create_web_tools
+from .tracing import span, trace_tools
 from .utils import get_llm
 
 def create_agents(resume_path, config):
+    with span('create_agents', 'setup'):
+        return _create_agents(resume_path, config)
+
+def _create_agents(resume_path, config):
     # Set the Serper API key in the environment
     os.environ["SERPER_API_KEY"] = config['api_keys']['serper']
 
     # Create tools
-    search_tool = SerperDevTool()
-    scrape_tool = ScrapeWebsiteTool()
-    read_resume = FileReadTool(file_path=resume_path)
-    semantic_search_resume = MDXSearchTool(mdx=resume_path)
+    search_tool, scrape_tool = create_web_tools(config)
+    read_resume = create_resume_read_tool(resume_path, config)
+    semantic_search_resume = create_resume_search_tool(resume_path, config)
+    trace_tools([search_tool, scrape_tool, read_resume, semantic_search_resume])
+
+    # crewai's built-in memory is off for every agent; agents with agent_memory enabled
+    # search the bounded store of notes saved from earlier runs for this candidate instead
+    memory_tools = []
+
+    def with_memory(name, tools):
+        if not agent_memory_enabled(config, name):
+            return tools
+        if not memory_tools:
+            memory_tools.extend(trace_tools([create_memory_search_tool(resume_path, config)]))
+        return tools + memory_tools
 
     agent_llms = config.get('agent_llms', {})
     default_llm = {"service": "openai", "model": "gpt-4"}
@@ -19,11 +38,11 @@ def create_agents(resume_path, config):
     job_analyzer = Agent(
         role="Tech Job Researcher and Analyzer",
         goal="Scrape the job posting URL, extract the job description, and analyze key requirements.",
-        tools=[scrape_tool, search_tool],
+        tools=with_memory('job_analyzer', [scrape_tool, search_tool]),
         verbose=True,
         llm=get_llm(config, agent_llms.get('job_analyzer', default_llm)),
         allow_delegation=True,
-        memory=True,
+        memory=False,
         backstory=(
             "As a Job Researcher, your prowess in "
             "navigating and extracting critical "
@@ -38,33 +57,33 @@ def create_agents(resume_path, config):
     relevance_selector = Agent(
         role="Relevance Selector",
         goal="Identify and justify the most relevant sections in the resume based on the job description analysis.",
-        tools=[read_resume, semantic_search_resume, search_tool],
+        tools=with_memory('relevance_selector', [read_resume, semantic_search_resume, search_tool]),
         verbose=True,
         llm=get_llm(config, agent_llms.get('relevance_selector', default_llm)),
         allow_delegation=True,
-        memory=True,
+        memory=False,
         backstory="You excel at matching resume content to job requirements, using semantic search to find the most relevant information."
     )
 
     emphasis_strategist = Agent(
         role="Latex Resume Strategist",
         goal="Strategically utilize the created resume and rewrite it in latex format for an exemplary resume.",
-        tools=[read_resume, semantic_search_resume, search_tool],
+        tools=with_memory('emphasis_strategist', [read_resume, semantic_search_resume, search_tool]),
         verbose=True,
         llm=get_llm(config, agent_llms.get('emphasis_strategist', default_llm)),
         allow_delegation=True,
-        memory=True,
+        memory=False,
         backstory="Your expertise lies in highlighting key terms that will catch a recruiter's eye and demonstrate the candidate's fit for the role."
     )
 
     cover_letter_writer = Agent(
         role="Cover Letter Writer",
         goal="Craft a compelling, tailored cover letter that highlights the candidate's qualifications and enthusiasm for the role.",
-        tools=[read_resume, semantic_search_resume, search_tool],
+        tools=with_memory('cover_letter_writer', [read_resume, semantic_search_resume, search_tool]),
         verbose=True,
         llm=get_llm(config, agent_llms.get('cover_letter_writer', default_llm)),
         allow_delegation=False,
-        memory=True,
+        memory=False,
         backstory="You are a master of persuasive writing, able to create cover letters that effectively showcase a candidate's fit for a specific role and company culture."
     )
 
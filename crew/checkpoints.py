@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import time
+from crewai.tasks.task_output import TaskOutput
+from .stores import evict_files, file_hash, remove_file
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(".cache", "checkpoints")
+DEFAULT_TTL_DAYS = 30
+DEFAULT_MAX_ENTRIES = 2000
+
+def describe_llm(llm):
+    """
+    Identifies the model behind an agent for fingerprinting: the class plus model name,
+    temperature and, for routed models, the candidate list.
+    """
+    return {
+        'type': type(llm).__name__,
+        'model': getattr(llm, 'model_name', None) or getattr(llm, 'model', None),
+        'temperature': getattr(llm, 'temperature', None),
+        'candidates': getattr(llm, 'names', None),
+    }
+
+# crewai renamed TaskOutput.raw_output to raw; these helpers handle both
+def output_text(output):
+    return getattr(output, 'raw', None) or getattr(output, 'raw_output', None) or str(output)
+
+def task_output_text(task):
+    return output_text(task.output) if task.output is not None else None
+
+def task_fingerprint(task, inputs, posting_hash=None):
+    """
+    Hashes everything a task's output depends on: its prompt text, its agent's model,
+    the crew inputs, the posting's content (posting_hash, the hash of its description
+    or scraped text), the resume file's contents and the outputs of its context tasks.
+    Upstream tasks must have finished.
+
+    The posting URL is not part of the fingerprint, since the page behind it can change.
+    Returns None when a URL is given but the posting content could not be read.
+    """
+    if inputs.get('job_posting_url') and posting_hash is None:
+        return None
+    resume_path = inputs.get('super_resume_path')
+    payload = {
+        'description': task.description,
+        'expected_output': task.expected_output,
+        'agent': task.agent.role,
+        'llm': describe_llm(task.agent.llm),
+        'inputs': {key: value for key, value in inputs.items() if key != 'job_posting_url'},
+        'posting_hash': posting_hash,
+        'resume_hash': file_hash(resume_path) if resume_path and os.path.isfile(resume_path) else None,
+        'upstream': [task_output_text(dep) for dep in (task.context or [])],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def make_task_output(task, raw):
+    if 'raw' in TaskOutput.model_fields:
+        return TaskOutput(description=task.description, raw=raw, agent=task.agent.role)
+    return TaskOutput(description=task.description, raw_output=raw, exported_output=raw)
+
+def restore_task_output(task, raw):
+    """
+    Sets a task's output from a checkpoint so downstream tasks can use it as context,
+    and rewrites its output file.
+    """
+    task.output = make_task_output(task, raw)
+
+    if task.output_file:
+        os.makedirs(os.path.dirname(task.output_file) or '.', exist_ok=True)
+        with open(task.output_file, 'w', encoding='utf-8') as f:
+            f.write(raw)
+
+class CheckpointStore:
+    """
+    One JSON file per task fingerprint under the checkpoint directory.
+
+    Checkpoints older than ttl_days are not reused. Beyond max_entries, the least
+    recently used checkpoints are deleted.
+    """
+
+    def __init__(self, directory=DEFAULT_CHECKPOINT_DIR, ttl_days=DEFAULT_TTL_DAYS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.ttl = ttl_days * 24 * 60 * 60
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, fingerprint):
+        return os.path.join(self.directory, fingerprint + '.json')
+
+    def get(self, fingerprint):
+        path = self._path(fingerprint)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if checkpoint['created_at'] < time.time() - self.ttl:
+            remove_file(path)
+            return None
+        # The file's modification time tracks last use for eviction
+        os.utime(path)
+        return checkpoint['raw']
+
+    def put(self, fingerprint, task, raw):
+        tmp_path = self._path(fingerprint) + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'agent': task.agent.role, 'created_at': time.time(), 'raw': raw}, f)
+        os.replace(tmp_path, self._path(fingerprint))
+        evict_files(self.directory, self.max_entries, suffix='.json', max_age=self.ttl)
+
+def get_checkpoint_store(config):
+    """
+    Returns a CheckpointStore when `checkpoints.enabled` is true in the config, otherwise None.
+    """
+    checkpoint_config = config.get('checkpoints', {})
+    if not checkpoint_config.get('enabled', False):
+        return None
+    return CheckpointStore(
+        checkpoint_config.get('dir', DEFAULT_CHECKPOINT_DIR),
+        ttl_days=checkpoint_config.get('ttl_days', DEFAULT_TTL_DAYS),
+        max_entries=checkpoint_config.get('max_entries', DEFAULT_MAX_ENTRIES)
+    )
@@ -0,0 +1,114 @@
+import re
+from .checkpoints import make_task_output, task_output_text
+from .llm_pool import estimate_tokens
+
+DEFAULT_MAX_TOKENS = 1500
+# Outputs passed in full whatever the budget: the tailored resume is what later
+# tasks build on, so summarizing it would lose content
+DEFAULT_EXEMPT = ['relevance']
+# Lines at most this long are kept when prose is dropped (titles, dates, short facts)
+SHORT_LINE = 120
+# Budget a summarized output keeps even when exempt outputs use up the whole budget
+MIN_SUMMARY_TOKENS = 200
+
+LIST_ITEM_RE = re.compile(r'^\s*([-*+]|\d+[.)])\s+')
+HEADING_RE = re.compile(r'^\s*#{1,6}\s')
+
+def compact_text(text):
+    """
+    Normalizes markdown for prompting: drops trailing spaces and repeated blank lines.
+    Emphasis markers are kept, since they mark the keywords later tasks should bold.
+    """
+    lines = [line.rstrip() for line in text.splitlines()]
+    compacted = []
+    for line in lines:
+        if line or (compacted and compacted[-1]):
+            compacted.append(line)
+    return '\n'.join(compacted).strip()
+
+def summarize_output(text, max_tokens=DEFAULT_MAX_TOKENS):
+    """
+    Shrinks an upstream task output to fit max_tokens for downstream prompts.
+
+    Outputs already within budget are returned unchanged. Larger ones keep their
+    structure (headings, list items such as requirements and bullets, and short lines
+    such as job titles) and drop long prose such as justifications, then are cut at a
+    line boundary if still too long.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    text = compact_text(text)
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    structured = [
+        line for line in text.splitlines()
+        if HEADING_RE.match(line) or LIST_ITEM_RE.match(line) or len(line) <= SHORT_LINE
+    ]
+    kept = []
+    used = 0
+    for line in structured:
+        cost = estimate_tokens(line + '\n')
+        if used + cost > max_tokens:
+            kept.append('[...truncated to fit the context budget]')
+            break
+        kept.append(line)
+        used += cost
+    return '\n'.join(kept)
+
+def budget_context(task, max_tokens, exempt=()):
+    """
+    Returns the context tasks to run task with so that their outputs fit max_tokens in
+    total. Outputs of tasks in exempt are passed in full and count against the budget;
+    the others share what is left in proportion to their size.
+
+    Within budget the original context is returned. Otherwise summarized outputs go on
+    copies of the context tasks, so other tasks using the same context and the output
+    files keep the full text.
+    """
+    context = task.context or []
+    texts = [task_output_text(dep) or '' for dep in context]
+    total = sum(estimate_tokens(text) for text in texts)
+    if total <= max_tokens:
+        return context
+
+    is_exempt = [any(dep is other for other in exempt) for dep in context]
+    exempt_tokens = sum(estimate_tokens(text) for text, skip in zip(texts, is_exempt) if skip)
+    other_tokens = total - exempt_tokens
+    if exempt_tokens > max_tokens:
+        print(f"Warning: context passed in full to '{task.agent.role}' (~{exempt_tokens} tokens) is over its budget of {max_tokens} tokens")
+    available = max(max_tokens - exempt_tokens, MIN_SUMMARY_TOKENS)
+
+    budgeted = []
+    for dep, text, skip in zip(context, texts, is_exempt):
+        if skip or not other_tokens:
+            budgeted.append(dep)
+            continue
+        summary = summarize_output(text, max(available * estimate_tokens(text) // other_tokens, MIN_SUMMARY_TOKENS))
+        if summary == text:
+            budgeted.append(dep)
+            continue
+        print(f"Slimmed context from '{dep.agent.role}' for '{task.agent.role}': ~{estimate_tokens(text)} -> ~{estimate_tokens(summary)} tokens")
+        if summary.endswith('[...truncated to fit the context budget]'):
+            print(f"Warning: context from '{dep.agent.role}' was truncated for '{task.agent.role}'")
+        budgeted.append(dep.model_copy(update={'output': make_task_output(dep, summary)}))
+    return budgeted
+
+def get_context_budgets(config, task_names):
+    """
+    Returns ({task index: context token budget}, {indices of exempt tasks}) from
+    `context_budget` in the config, or None when context slimming is disabled.
+
+    Budgets apply to the total context a task reads: `max_tokens` sets the default and
+    `per_task` overrides it by the name of the task that reads the context. `exempt`
+    names the tasks whose outputs are always passed in full.
+    """
+    budget_config = config.get('context_budget', {})
+    if not budget_config.get('enabled', False):
+        return None
+    default = budget_config.get('max_tokens', DEFAULT_MAX_TOKENS)
+    per_task = budget_config.get('per_task', {})
+    exempt_names = budget_config.get('exempt', DEFAULT_EXEMPT)
+    budgets = {i: per_task.get(name, default) for i, name in enumerate(task_names)}
+    exempt = {i for i, name in enumerate(task_names) if name in exempt_names}
+    return budgets, exempt
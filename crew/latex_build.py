@@ -0,0 +1,208 @@
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .stores import evict_files, remove_file
+from .tracing import record, span
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "latex")
+# Cached PDFs (including the intermediate builds of page fitting) and formats kept,
+# least recently used first out
+DEFAULT_MAX_PDFS = 500
+DEFAULT_MAX_FORMATS = 20
+# A preamble whose format failed to build is retried after this long, e.g. once
+# mylatexformat has been installed
+FAILED_FORMAT_RETRY = 24 * 60 * 60
+# Header commands written by the LLM start the part of the preamble that varies per document
+NAME_RE = re.compile(r'\\name(?![A-Za-z@])')
+
+# Serializes format builds so concurrent compiles don't dump the same format twice
+_format_lock = threading.Lock()
+
+def _hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+def split_preamble(latex_content):
+    """
+    Returns (preamble, rest), where preamble is the fixed part of the preamble that can
+    be precompiled: everything before \\name (the header written per document), or
+    before \\begin{document} if there is no \\name. Returns None if there is no
+    document body.
+    """
+    end = latex_content.find(r'\begin{document}')
+    if end == -1:
+        return None
+    name = NAME_RE.search(latex_content, 0, end)
+    index = name.start() if name else end
+    return latex_content[:index].rstrip() + '\n', latex_content[index:]
+
+_pdflatex_version = None
+
+def pdflatex_version():
+    """
+    Returns the first line of `pdflatex --version`. A format only loads in the pdfTeX
+    build that wrote it, so the version is part of the format key.
+    """
+    global _pdflatex_version
+    if _pdflatex_version is None:
+        try:
+            output = subprocess.run(['pdflatex', '--version'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT).stdout
+            _pdflatex_version = output.decode('utf-8', errors='replace').split('\n')[0]
+        except OSError:
+            _pdflatex_version = ''
+    return _pdflatex_version
+
+def copy_atomic(source, destination):
+    # Written under a temporary name first, so concurrent builds never read a partial file
+    tmp_path = f"{destination}.{os.getpid()}.{threading.get_ident()}.tmp"
+    shutil.copy(source, tmp_path)
+    os.replace(tmp_path, destination)
+
+def _run_pdflatex(args, cwd):
+    return subprocess.run(
+        ['pdflatex', '-interaction=nonstopmode', '-halt-on-error'] + args,
+        cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+
+def ensure_format(preamble, cls_file, cache_dir=DEFAULT_CACHE_DIR, max_formats=DEFAULT_MAX_FORMATS):
+    """
+    Precompiles the preamble and class file into a pdflatex format with mylatexformat.
+
+    Formats are keyed by the hash of the preamble, the class file contents and the
+    pdflatex version, and kept
+    in <cache_dir>/formats, at most max_formats of them. Returns the .fmt path, or None
+    if the format could not be built (a marker file stops later builds from retrying
+    the same preamble for FAILED_FORMAT_RETRY seconds).
+    """
+    with open(cls_file, 'r') as f:
+        cls_content = f.read()
+    format_name = 'preamble_' + _hash(preamble, cls_content, pdflatex_version())[:16]
+    formats_dir = os.path.join(cache_dir, 'formats')
+    format_path = os.path.join(formats_dir, format_name + '.fmt')
+    failed_marker = os.path.join(formats_dir, format_name + '.failed')
+
+    with _format_lock:
+        if os.path.exists(format_path):
+            os.utime(format_path)
+            return format_path
+        if os.path.exists(failed_marker):
+            if os.path.getmtime(failed_marker) > time.time() - FAILED_FORMAT_RETRY:
+                return None
+            os.remove(failed_marker)
+
+        os.makedirs(formats_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory() as tempdir:
+            shutil.copy(cls_file, tempdir)
+            with open(os.path.join(tempdir, 'preamble.tex'), 'w') as f:
+                f.write(preamble + '\\begin{document}\n\\end{document}\n')
+
+            print("Precompiling LaTeX preamble...")
+            with span('pdflatex_format', 'pdf'):
+                result = subprocess.run(
+                    ['pdflatex', '-ini', '-interaction=nonstopmode', f'-jobname={format_name}',
+                     '&pdflatex', 'mylatexformat.ltx', 'preamble.tex'],
+                    cwd=tempdir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+                )
+            built_path = os.path.join(tempdir, format_name + '.fmt')
+            if result.returncode != 0 or not os.path.isfile(built_path):
+                print("Could not precompile the LaTeX preamble, falling back to full compiles.")
+                open(failed_marker, 'w').close()
+                return None
+            copy_atomic(built_path, format_path)
+        evict_files(formats_dir, max_formats, suffix='.fmt')
+    return format_path
+
+def build_pdf(latex_content, cls_file, output_path, cache_dir=DEFAULT_CACHE_DIR, max_pdfs=DEFAULT_MAX_PDFS):
+    """
+    Compiles LaTeX source into output_path, reusing earlier work where possible:
+
+    - If the same source and class file were compiled before, the cached PDF is copied
+      and pdflatex is not run at all. At most max_pdfs PDFs are kept, least recently
+      used first out.
+    - Otherwise the document is compiled against a precompiled preamble format, falling
+      back to a regular pdflatex run if the format is unavailable. If the compile fails
+      with the format, the format is deleted (it may be stale or damaged) and the
+      document is compiled again without it.
+
+    Returns True if a PDF was written.
+    """
+    with open(cls_file, 'r') as f:
+        cls_content = f.read()
+    pdfs_dir = os.path.join(cache_dir, 'pdfs')
+    cached_pdf = os.path.join(pdfs_dir, _hash(latex_content, cls_content) + '.pdf')
+
+    try:
+        os.utime(cached_pdf)
+        shutil.copy(cached_pdf, output_path)
+    except OSError:
+        # Not built before, or evicted meanwhile
+        pass
+    else:
+        record('pdflatex', 'pdf', cache_hit=True)
+        print(f"Reused cached PDF build: {output_path}")
+        return True
+
+    parts = split_preamble(latex_content)
+    format_path = ensure_format(parts[0], cls_file, cache_dir) if parts is not None else None
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        shutil.copy(cls_file, tempdir)
+        pdf_path = os.path.join(tempdir, 'document.pdf')
+        print("Compiling LaTeX file...")
+        if format_path:
+            with open(os.path.join(tempdir, 'document.tex'), 'w') as f:
+                # With the format loaded, mylatexformat skips the source up to %endofdump
+                # and runs the per-document header after it
+                f.write(parts[0] + '%endofdump\n' + parts[1])
+            with span('pdflatex', 'pdf', cache_hit=False, precompiled_format=True):
+                shutil.copy(format_path, tempdir)
+                format_name = os.path.splitext(os.path.basename(format_path))[0]
+                result = _run_pdflatex([f'-fmt={format_name}', 'document.tex'], tempdir)
+            if result.returncode != 0 or not os.path.isfile(pdf_path):
+                print("Compile with the precompiled preamble failed, retrying without it.")
+                remove_file(format_path)
+                format_path = None
+
+        if not format_path:
+            with open(os.path.join(tempdir, 'document.tex'), 'w') as f:
+                f.write(latex_content)
+            with span('pdflatex', 'pdf', cache_hit=False, precompiled_format=False):
+                result = _run_pdflatex(['document.tex'], tempdir)
+
+        if result.returncode != 0 or not os.path.isfile(pdf_path):
+            print(f"Error during LaTeX compilation:\n{result.stdout.decode('utf-8', errors='replace')[-2000:]}")
+            return False
+
+        os.makedirs(pdfs_dir, exist_ok=True)
+        copy_atomic(pdf_path, cached_pdf)
+        shutil.copy(pdf_path, output_path)
+    evict_files(pdfs_dir, max_pdfs, suffix='.pdf')
+    print(f"PDF generated successfully: {output_path}")
+    return True
+
+def build_pdfs(builds, cls_file, max_workers=4, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Compiles many documents concurrently over a bounded worker pool.
+
+    Args:
+    - builds: List of (latex_content, output_path) pairs.
+    - cls_file: Path to the .cls file shared by all documents.
+    - max_workers: Maximum number of pdflatex processes running at once.
+
+    Returns a list of (output_path, success) pairs in the same order.
+    """
+    def build_one(build):
+        latex_content, output_path = build
+        return output_path, build_pdf(latex_content, cls_file, output_path, cache_dir)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return list(executor.map(build_one, builds))
@@ -0,0 +1,248 @@
+import bisect
+import re
+
+# Preamble that replaces everything the LLM writes before \name
+RESUME_PREAMBLE = r"""\documentclass{resume}
+        \usepackage{enumitem}
+        \setlist{topsep=-3pt, itemsep=-3pt}
+        \usepackage[left=0.45in ,top=0.4in, right=0.45in ,bottom=0.4in]{geometry}
+
+        \newcommand{\tab}[1]{\hspace{.2667\textwidth}\rlap{#1}}
+        \newcommand{\MYhref}[3][blue]{\href{#2}{\color{#1}{#3}}}
+        \newcommand{\itab}[1]{\hspace{0em}\rlap{#1}}
+        """
+
+TOKEN_RE = re.compile(r"""
+    (?P<command>\\(?:[A-Za-z@]+|[\s\S]))
+  | (?P<marker>\[\[[^\]\n]*\]\])
+  | (?P<placeholder><<[^<>\n]*>>)
+  | (?P<open>[{\[])
+  | (?P<close>[}\]])
+  | (?P<newline>\n)
+  | (?P<special>[$&_#%])
+  | (?P<text>[^\\{}\[\]$&_#%<\n]+|<)
+""", re.VERBOSE)
+
+# Commands whose [...] is always a real optional argument, never a stand-in for {...}
+OPTIONAL_ARG_COMMANDS = {'\\', 'item'}
+URL_COMMANDS = {'href', 'url', 'MYhref'}
+# Commands that end the text of the current \item
+BULLET_END_COMMANDS = {'item', 'begin', 'end'}
+UNESCAPED_DOLLAR_RE = re.compile(r'(?<!\\)\$')
+
+class LatexCheckError(ValueError):
+    """
+    Raised when LaTeX has problems that can't be repaired. `problems` lists them with locations.
+    """
+
+    def __init__(self, problems):
+        super().__init__("LaTeX check failed:\n" + '\n'.join(problems))
+        self.problems = problems
+
+class Group:
+    __slots__ = ('kind', 'command', 'arg_index', 'pos', 'name')
+
+    def __init__(self, kind, command, arg_index, pos):
+        # kind: "brace" ({...}), "arg" ([...] standing in for {...}), "optional" or "text"
+        self.kind = kind
+        self.command = command
+        self.arg_index = arg_index
+        self.pos = pos
+        self.name = [] if command in ('begin', 'end') and arg_index == 0 else None
+
+def _match_brackets(tokens):
+    # Maps the index of each [ token to the index of its ], for the "[...]{" lookahead
+    matches = {}
+    stack = []
+    for i, token in enumerate(tokens):
+        if token.lastgroup == 'open' and token.group() == '[':
+            stack.append(i)
+        elif token.lastgroup == 'close' and token.group() == ']' and stack:
+            matches[stack.pop()] = i
+    return matches
+
+def normalize_latex(content, first_line=1):
+    """
+    Checks and repairs LLM-written LaTeX in a single tokenizer pass before it is compiled.
+
+    - Everything before \\name is replaced with RESUME_PREAMBLE and [[...]] template
+      markers are removed.
+    - [...] written in place of {...} (the prompt template avoids braces) becomes {...}
+      after commands and inside such arguments. Real optional arguments (after \\\\ or
+      \\item, or followed by {...}) and brackets in plain text are kept.
+    - Unescaped %, &, _, # and unpaired $ in bullet text are escaped, except in URLs.
+    - Stray closing braces are dropped and environments left open at the end are closed.
+
+    Unbalanced braces, mismatched \\begin/\\end and leftover <<placeholders>> can't be
+    repaired and raise LatexCheckError with line and column for each problem.
+
+    Locations count lines from first_line, so they can point into the file the LaTeX came from.
+    Returns (latex, fixes) where fixes describes each repair made.
+    """
+    line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+
+    def where(pos):
+        line = bisect.bisect_right(line_starts, pos)
+        return f"line {line + first_line - 1}, column {pos - line_starts[line - 1] + 1}"
+
+    tokens = list(TOKEN_RE.finditer(content))
+    bracket_matches = _match_brackets(tokens)
+
+    out = []
+    fixes = []
+    problems = []
+    groups = []
+    environments = []
+
+    start = 0
+    for i, token in enumerate(tokens):
+        if token.lastgroup == 'command' and token.group() == r'\name':
+            out.append(RESUME_PREAMBLE)
+            start = i
+            break
+
+    chain_command = None
+    chain_index = 0
+    in_bullet = False
+    in_math = False
+    blank_line = False
+    skip_until = -1
+
+    for i in range(start, len(tokens)):
+        token = tokens[i]
+        kind = token.lastgroup
+        value = token.group()
+        pos = token.start()
+        if pos < skip_until:
+            continue
+
+        # The command (if any) whose arguments may continue at this token
+        command, arg_index = chain_command, chain_index
+        chain_command = None
+
+        if kind == 'command':
+            name = value[1:]
+            out.append(value)
+            chain_command, chain_index = name, 0
+            if name in BULLET_END_COMMANDS:
+                in_bullet = name == 'item'
+            blank_line = False
+
+        elif kind == 'marker':
+            continue
+
+        elif kind == 'placeholder':
+            problems.append(f"{where(pos)}: unfilled placeholder {value}")
+            out.append(value)
+
+        elif kind == 'open':
+            if value == '{':
+                groups.append(Group('brace', command, arg_index, pos))
+                out.append('{')
+            else:
+                real_optional = (
+                    command in OPTIONAL_ARG_COMMANDS
+                    or (i in bracket_matches and bracket_matches[i] + 1 < len(tokens)
+                        and tokens[bracket_matches[i] + 1].group() == '{')
+                )
+                if command is not None and not real_optional:
+                    groups.append(Group('arg', command, arg_index, pos))
+                    out.append('{')
+                elif command is not None:
+                    groups.append(Group('optional', command, arg_index, pos))
+                    out.append('[')
+                elif any(group.kind == 'arg' for group in groups):
+                    groups.append(Group('arg', None, 0, pos))
+                    out.append('{')
+                else:
+                    groups.append(Group('text', None, 0, pos))
+                    out.append('[')
+
+        elif kind == 'close':
+            if value == '}':
+                while groups and groups[-1].kind == 'text':
+                    groups.pop()
+                if not groups:
+                    fixes.append(f"{where(pos)}: removed unmatched '}}'")
+                    continue
+                if groups[-1].kind == 'optional':
+                    problems.append(f"{where(pos)}: '}}' closes '[' opened at {where(groups[-1].pos)}")
+            else:
+                if not groups or groups[-1].kind == 'brace':
+                    if any(group.kind == 'arg' for group in groups):
+                        problems.append(f"{where(pos)}: ']' closes '{{' opened at {where(groups[-1].pos)}")
+                    out.append(']')
+                    continue
+
+            group = groups.pop()
+            out.append(']' if group.kind in ('optional', 'text') else '}')
+            if group.name is not None:
+                env = ''.join(group.name).strip()
+                if group.command == 'begin':
+                    environments.append((env, group.pos))
+                elif environments and environments[-1][0] == env:
+                    environments.pop()
+                elif any(open_env == env for open_env, _ in environments):
+                    open_env, open_pos = environments[-1]
+                    problems.append(f"{where(pos)}: \\end{{{env}}} while \\begin{{{open_env}}} from {where(open_pos)} is still open")
+                    while environments and environments[-1][0] != env:
+                        environments.pop()
+                    environments.pop()
+                else:
+                    problems.append(f"{where(pos)}: \\end{{{env}}} without a matching \\begin")
+            if group.command is not None and group.kind != 'text':
+                chain_command, chain_index = group.command, group.arg_index + 1
+
+        elif kind == 'newline':
+            out.append(value)
+            if blank_line:
+                in_bullet = False
+            blank_line = True
+            continue
+
+        elif kind == 'special':
+            in_url = any(group.command in URL_COMMANDS and group.arg_index == 0 for group in groups)
+            escape = in_bullet and not in_url
+            if value == '$':
+                if in_math:
+                    escape = False
+                elif escape:
+                    line_end = content.find('\n', pos)
+                    closing = UNESCAPED_DOLLAR_RE.search(content, pos + 1, line_end if line_end != -1 else len(content))
+                    escape = closing is None
+                if not escape:
+                    in_math = not in_math
+            elif value == '_':
+                escape = escape and not in_math
+            elif value == '%' and not escape and not in_url:
+                # A comment: copied verbatim up to the end of the line
+                line_end = content.find('\n', pos)
+                line_end = len(content) if line_end == -1 else line_end
+                out.append(content[pos:line_end])
+                skip_until = line_end
+                continue
+
+            if escape:
+                fixes.append(f"{where(pos)}: escaped '{value}' in bullet text")
+                out.append('\\' + value)
+            else:
+                out.append(value)
+
+        else:
+            out.append(value)
+
+        if kind != 'text' or value.strip():
+            blank_line = False
+        if kind == 'text' and groups and groups[-1].name is not None:
+            groups[-1].name.append(value)
+
+    for group in groups:
+        if group.kind != 'text':
+            problems.append(f"{where(group.pos)}: '{'{' if group.kind == 'brace' else '['}' is never closed")
+    if problems:
+        raise LatexCheckError(problems)
+
+    for env, pos in reversed(environments):
+        fixes.append(f"{where(pos)}: closed environment '{env}' left open at the end")
+        out.append(f"\n\\end{{{env}}}")
+    return ''.join(out), fixes
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from .stores import connect, evict_lru, get_shared
+from .tracing import record
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm_cache.sqlite")
+DEFAULT_MAX_ENTRIES = 2000
+
+class SQLiteLLMCache(BaseCache):
+    """
+    Exact-match LLM response cache stored in SQLite with LRU eviction.
+
+    LangChain calls lookup/update with the rendered prompt and an `llm_string` that
+    encodes the provider class, model and sampling parameters, so entries are keyed by
+    (service, model, temperature, messages).
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, generations TEXT, last_access REAL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(prompt, llm_string):
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode('utf-8')).hexdigest()
+
+    def lookup(self, prompt, llm_string):
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute("SELECT generations FROM responses WHERE key = ?", (key,)).fetchone()
+            record('llm_cache', 'cache', cache_hit=row is not None)
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return [loads(generation) for generation in json.loads(row[0])]
+
+    def update(self, prompt, llm_string, return_val):
+        generations = json.dumps([dumps(generation) for generation in return_val])
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (self._key(prompt, llm_string), generations, time.time())
+            )
+            evict_lru(self._conn, 'responses', self.max_entries)
+            self._conn.commit()
+
+    def clear(self, **kwargs):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+def get_llm_cache(config):
+    """
+    Returns the shared response cache when `llm_cache.enabled` is true in the config,
+    otherwise None.
+    """
+    cache_config = config.get('llm_cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+
+    path = cache_config.get('path', DEFAULT_CACHE_PATH)
+    return get_shared('llm_cache', path, lambda: SQLiteLLMCache(path, max_entries=cache_config.get('max_entries', DEFAULT_MAX_ENTRIES)))
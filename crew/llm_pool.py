@@ -0,0 +1,154 @@
+import threading
+import time
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+from .stores import get_shared
+from .tracing import token_usage
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at `per_minute` units per minute,
+    holding at most one minute's worth.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        """
+        Blocks until `amount` units are available and takes them. Requests larger than
+        the bucket are let through once it is full, so they can't block forever.
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def debit(self, amount):
+        """
+        Takes units without blocking, e.g. for output tokens only known after a call.
+        The balance may go negative, which delays later acquires.
+        """
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+
+class ProviderRateLimiter:
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+def get_rate_limiter(config, service):
+    """
+    Returns the process-wide limiter for a provider from `rate_limits.<service>` in the
+    config, or None if the provider has no limits configured.
+    """
+    limits = config.get('rate_limits', {}).get(service)
+    if not limits:
+        return None
+
+    # Shared by every agent and every concurrent job in the process
+    return get_shared('rate_limiter', service, lambda: ProviderRateLimiter(
+        limits.get('requests_per_minute'), limits.get('tokens_per_minute')
+    ))
+
+def estimate_tokens(text):
+    # Rough average for English text; the prompt estimate is corrected against the
+    # provider's reported usage after the call
+    return max(1, len(text) // 4)
+
+class RateLimitCallbackHandler(BaseCallbackHandler):
+    """
+    Applies a provider's rate limits to each LLM call that reaches the provider. Waiting
+    here turns rate limits into backpressure instead of provider errors that crash the crew.
+
+    Prompt tokens are estimated when the call starts, but the limits are only taken by
+    `rate_limiter`, which langchain runs after its response cache lookup, so cache hits
+    neither wait nor use up budget. Once the response reports usage, the token bucket is
+    debited for the output tokens and for any prompt tokens the estimate missed.
+    """
+
+    # Keeps the callbacks on the calling thread, where the per-call state lives
+    run_inline = True
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self._call = threading.local()
+
+    @property
+    def rate_limiter(self):
+        return PendingCallLimiter(self)
+
+    def _before_call(self, text):
+        self._call.estimate = estimate_tokens(text)
+        self._call.charged = None
+
+    def acquire(self):
+        """
+        Takes the limits for the call started on this thread.
+        """
+        estimate = getattr(self._call, 'estimate', 1)
+        if self.limiter.requests:
+            self.limiter.requests.acquire()
+        if self.limiter.tokens:
+            self.limiter.tokens.acquire(estimate)
+        self._call.charged = estimate
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self._before_call(''.join(str(message.content) for batch in messages for message in batch))
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self._before_call(''.join(prompts))
+
+    def on_llm_end(self, response, **kwargs):
+        charged = getattr(self._call, 'charged', None)
+        self._call.charged = None
+        # Nothing was taken for responses served from the cache
+        if charged is None or not self.limiter.tokens:
+            return
+        input_tokens, output_tokens = token_usage(response)
+        correction = input_tokens - charged if input_tokens else 0
+        self.limiter.tokens.debit(correction + output_tokens)
+
+    def on_llm_error(self, error, **kwargs):
+        self._call.charged = None
+
+class PendingCallLimiter(BaseRateLimiter):
+    """
+    langchain rate limiter that takes a RateLimitCallbackHandler's limits for the call
+    it has seen start.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def acquire(self, *, blocking=True):
+        self.handler.acquire()
+        return True
+
+    async def aacquire(self, *, blocking=True):
+        # Blocks the event loop while waiting; crews call their LLMs synchronously
+        self.handler.acquire()
+        return True
+
+def get_pooled_llm(key, create):
+    """
+    Returns the shared base client for key, creating it with create() on first use.
+    Callers should hand out model_copy()s of it: copies share the underlying SDK client
+    and its HTTP connection pool, but keep their own callbacks and cache.
+    """
+    return get_shared('llm_client', key, create)
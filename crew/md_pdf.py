@@ -0,0 +1,109 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .stores import evict_files
+from .tracing import record, span
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "md_pdf")
+DEFAULT_MAX_ENTRIES = 500
+
+DEFAULT_STYLESHEET = """
+body { font-family: "Helvetica Neue", Arial, sans-serif; font-size: 11pt; line-height: 1.4; margin: 0 0.5in; }
+h1, h2, h3 { margin: 0.6em 0 0.3em; }
+p, ul { margin: 0 0 0.6em; }
+"""
+
+WKHTMLTOPDF_OPTIONS = {'encoding': 'UTF-8', 'quiet': ''}
+
+# pdfkit.configuration() spawns `which wkhtmltopdf` each time, so it is looked up once
+_pdfkit_configuration = None
+_configuration_lock = threading.Lock()
+
+def _get_pdfkit_configuration():
+    global _pdfkit_configuration
+    import pdfkit
+
+    with _configuration_lock:
+        if _pdfkit_configuration is None:
+            _pdfkit_configuration = pdfkit.configuration()
+        return _pdfkit_configuration
+
+def render_html(md_content, stylesheet):
+    """
+    Renders Markdown into a standalone HTML page with the stylesheet inlined.
+    """
+    import markdown
+
+    body = markdown.markdown(md_content)
+    return f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><style>{stylesheet}</style></head><body>\n{body}\n</body></html>'
+
+def convert_one(md_file, pdf_file, stylesheet, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Converts one Markdown file to PDF and returns its result dict:
+    {'input', 'output', 'status', 'error', 'time'} with status one of "converted",
+    "cached" (an identical input was converted before), "missing" or "failed".
+    """
+    start = time.perf_counter()
+    result = {'input': md_file, 'output': pdf_file, 'status': 'converted', 'error': None}
+    try:
+        if not os.path.exists(md_file):
+            result['status'] = 'missing'
+            return result
+
+        with open(md_file, 'r', encoding='utf-8') as f:
+            md_content = f.read()
+        key = hashlib.sha256(f"{stylesheet}\x00{md_content}".encode('utf-8')).hexdigest()
+        cached_pdf = os.path.join(cache_dir, key + '.pdf')
+
+        if os.path.isfile(cached_pdf):
+            record('wkhtmltopdf', 'pdf', cache_hit=True, file=md_file)
+            os.utime(cached_pdf)
+            shutil.copy(cached_pdf, pdf_file)
+            result['status'] = 'cached'
+            return result
+
+        # Imported here so a missing converter is reported as a failed result
+        import pdfkit
+
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_pdf = f"{cached_pdf}.{threading.get_ident()}.tmp"
+        with span('wkhtmltopdf', 'pdf', cache_hit=False, file=md_file):
+            pdfkit.from_string(
+                render_html(md_content, stylesheet), tmp_pdf,
+                options=WKHTMLTOPDF_OPTIONS, configuration=_get_pdfkit_configuration()
+            )
+        os.replace(tmp_pdf, cached_pdf)
+        shutil.copy(cached_pdf, pdf_file)
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = str(e)
+    finally:
+        result['time'] = time.perf_counter() - start
+    return result
+
+def convert_md_to_pdfs(md_files, max_workers=4, stylesheet_file=None, cache_dir=DEFAULT_CACHE_DIR, max_entries=DEFAULT_MAX_ENTRIES):
+    """
+    Converts many Markdown files to PDFs next to them (same name, .pdf extension).
+
+    The stylesheet is read once and shared by every document. Conversions run over a
+    bounded worker pool, so at most max_workers wkhtmltopdf processes run at once, and
+    inputs identical to an earlier conversion are copied from the cache instead. The
+    cache keeps the max_entries most recently used PDFs.
+
+    Returns a list of result dicts (see convert_one) in the same order as md_files.
+    """
+    stylesheet = DEFAULT_STYLESHEET
+    if stylesheet_file:
+        with open(stylesheet_file, 'r', encoding='utf-8') as f:
+            stylesheet = f.read()
+
+    def convert(md_file):
+        return convert_one(md_file, os.path.splitext(md_file)[0] + '.pdf', stylesheet, cache_dir)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        results = list(executor.map(convert, md_files))
+    evict_files(cache_dir, max_entries, suffix='.pdf')
+    return results
@@ -0,0 +1,102 @@
+import re
+import zlib
+from .structured_resume import RESUME_TEMPLATE, render_resume_latex
+
+MIN_BULLETS = 1
+MIN_SKILLS = 3
+MAX_ITERATIONS = 30
+
+# Progressively tighter list spacing and margins applied to the resume template
+SPACING_LEVELS = [
+    [],
+    [('itemsep=-3pt', 'itemsep=-4pt'), ('top=0.4in', 'top=0.3in'), ('bottom=0.4in', 'bottom=0.3in')],
+    [('topsep=-3pt', 'topsep=-5pt'), ('itemsep=-3pt', 'itemsep=-5pt'), ('left=0.45in', 'left=0.35in'),
+     ('top=0.4in', 'top=0.25in'), ('right=0.45in', 'right=0.35in'), ('bottom=0.4in', 'bottom=0.25in')],
+]
+
+PAGE_RE = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+STREAM_RE = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.DOTALL)
+
+def pdf_page_count(pdf_path):
+    """
+    Counts the pages of a PDF by counting its page objects, including those packed into
+    compressed object streams (as pdflatex writes them by default).
+    """
+    with open(pdf_path, 'rb') as f:
+        data = f.read()
+
+    count = len(PAGE_RE.findall(data))
+    for stream in STREAM_RE.findall(data):
+        try:
+            count += len(PAGE_RE.findall(zlib.decompress(stream)))
+        except zlib.error:
+            continue
+    return count
+
+def spaced_template(level):
+    template = RESUME_TEMPLATE
+    for old, new in SPACING_LEVELS[level]:
+        template = template.replace(old, new)
+    return template
+
+def drop_lowest_ranked_bullet(resume):
+    """
+    Drops the last (lowest-ranked) bullet from the job or project with the most bullets.
+    Returns False if every entry is already at MIN_BULLETS.
+    """
+    entries = [(job.achievements, job.job_title) for job in resume.jobs]
+    entries += [(project.descriptions, project.project_name) for project in resume.projects]
+    entries = [entry for entry in entries if len(entry[0]) > MIN_BULLETS]
+    if not entries:
+        return False
+    bullets, name = max(entries, key=lambda entry: len(entry[0]))
+    bullets.pop()
+    print(f"Trimmed a bullet from '{name}'")
+    return True
+
+def shorten_skills(resume):
+    """
+    Drops the last (lowest-ranked) skill from the longest skill category.
+    Returns False if every category is already at MIN_SKILLS.
+    """
+    categories = [category for category in resume.skills if len(category.skills) > MIN_SKILLS]
+    if not categories:
+        return False
+    category = max(categories, key=lambda category: len(category.skills))
+    category.skills.pop()
+    print(f"Trimmed a skill from '{category.skill_category}'")
+    return True
+
+def fit_resume_to_pages(resume, compile_pdf, max_pages=1):
+    """
+    Compiles the structured resume and, while it runs over max_pages, trims it locally and
+    recompiles: first tightening spacing, then dropping the lowest-ranked bullets, then
+    shortening skill lists. No LLM calls are made.
+
+    Args:
+    - resume: StructuredResume to render. It is not modified.
+    - compile_pdf: Callable taking LaTeX source and returning the generated PDF path or None.
+    - max_pages: Page limit to fit into (default: 1).
+
+    Returns the path of the final PDF, or None if compilation failed.
+    """
+    resume = resume.model_copy(deep=True)
+    spacing = 0
+
+    for _ in range(MAX_ITERATIONS):
+        pdf_path = compile_pdf(render_resume_latex(resume, spaced_template(spacing)))
+        if pdf_path is None:
+            return None
+
+        pages = pdf_page_count(pdf_path)
+        if pages <= max_pages:
+            return pdf_path
+        print(f"Resume is {pages} pages, trimming to fit {max_pages}...")
+
+        if spacing < len(SPACING_LEVELS) - 1:
+            spacing += 1
+        elif not (drop_lowest_ranked_bullet(resume) or shorten_skills(resume)):
+            break
+
+    print(f"Could not fit the resume on {max_pages} page(s); keeping the last build.")
+    return pdf_path
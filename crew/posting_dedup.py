@@ -0,0 +1,230 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import numpy as np
+from .checkpoints import output_text
+from .stores import connect, evict_lru, get_shared
+from .tool_cache import create_web_tools, normalize_url
+from .tracing import record
+
+DEFAULT_STORE_PATH = os.path.join(".cache", "postings.sqlite")
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_MAX_ENTRIES = 5000
+SHINGLE_WORDS = 5
+# Postings with fewer shingles are too short to fingerprint reliably
+MIN_SHINGLES = 50
+# Scraped lines with fewer words are navigation, headers, footers or link lists
+MIN_BODY_LINE_WORDS = 8
+# Pages that are a login wall or bot check rather than a posting. Real postings can
+# mention these too ("Sign in to see who you know at ..."), so only short pages or
+# pages made up mostly of such lines are rejected
+BLOCKED_PAGE_WORDS = 150
+BLOCKED_PAGE_RE = re.compile(
+    r'captcha|are you a robot|verify you are (a )?human|access denied|enable javascript|'
+    r'(sign|log) ?in to (continue|view|see)',
+    re.IGNORECASE
+)
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+# Mersenne prime for the universal hash family; coefficients fit in 32 bits so
+# a * x + b stays below 2**64
+PRIME = (1 << 61) - 1
+
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+def shingles(text):
+    """
+    Returns the set of hashed word shingles (SHINGLE_WORDS consecutive words) of text.
+    """
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < SHINGLE_WORDS:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = (' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1))
+    return {int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=4).digest(), 'little') for gram in grams}
+
+def minhash(text):
+    """
+    Returns the MinHash signature (NUM_PERM uint64 values) of text, or None when it has
+    fewer than MIN_SHINGLES shingles.
+    """
+    hashed = shingles(text)
+    if len(hashed) < MIN_SHINGLES:
+        return None
+    values = np.fromiter(hashed, dtype=np.uint64)
+    return ((np.outer(values, _A) + _B) % PRIME).min(axis=0)
+
+def similarity(signature, other):
+    # Fraction of matching MinHash values estimates the Jaccard similarity of the shingle sets
+    return float(np.mean(signature == other))
+
+def band_keys(signature):
+    return [
+        hashlib.sha1(signature[band * ROWS:(band + 1) * ROWS].tobytes()).hexdigest()[:16]
+        for band in range(BANDS)
+    ]
+
+class PostingStore:
+    """
+    SQLite store of past postings' MinHash signatures and job analyses, indexed by
+    LSH bands so lookups only compare against postings that share a band.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, threshold=DEFAULT_THRESHOLD, max_entries=DEFAULT_MAX_ENTRIES):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "id INTEGER PRIMARY KEY, url TEXT, signature BLOB, analysis TEXT, created_at REAL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS bands (band INTEGER, bucket TEXT, posting_id INTEGER)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS bands_bucket ON bands (band, bucket)")
+        self._conn.commit()
+
+    def count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def find(self, signature):
+        """
+        Returns (analysis, similarity, url) of the most similar stored posting at or above
+        the threshold, or None. Matching is by content only, so an edited posting under the
+        same URL is analyzed again.
+        """
+        with self._lock:
+            candidate_ids = set()
+            for band, bucket in enumerate(band_keys(signature)):
+                candidate_ids.update(
+                    posting_id for (posting_id,) in self._conn.execute(
+                        "SELECT posting_id FROM bands WHERE band = ? AND bucket = ?", (band, bucket)
+                    )
+                )
+            best = None
+            for posting_id in candidate_ids:
+                row = self._conn.execute(
+                    "SELECT signature, analysis, url FROM postings WHERE id = ?", (posting_id,)
+                ).fetchone()
+                if row is None:
+                    continue
+                score = similarity(signature, np.frombuffer(row[0], dtype=np.uint64))
+                if score >= self.threshold and (best is None or score > best[1]):
+                    best = (row[1], score, row[2])
+        return best
+
+    def add(self, signature, url, analysis):
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO postings (url, signature, analysis, created_at) VALUES (?, ?, ?, ?)",
+                (normalize_url(url) if url else '', signature.tobytes(), analysis, time.time())
+            )
+            self._conn.executemany(
+                "INSERT INTO bands VALUES (?, ?, ?)",
+                [(band, bucket, cursor.lastrowid) for band, bucket in enumerate(band_keys(signature))]
+            )
+            evict_lru(self._conn, 'postings', self.max_entries, order_by='created_at')
+            self._conn.execute("DELETE FROM bands WHERE posting_id NOT IN (SELECT id FROM postings)")
+            self._conn.commit()
+
+def get_posting_store(config):
+    """
+    Returns the shared PostingStore when `posting_dedup.enabled` is true in the config, otherwise None.
+    """
+    dedup_config = config.get('posting_dedup', {})
+    if not dedup_config.get('enabled', False):
+        return None
+    path = dedup_config.get('path', DEFAULT_STORE_PATH)
+
+    return get_shared('posting_dedup', path, lambda: PostingStore(
+        path,
+        threshold=dedup_config.get('threshold', DEFAULT_THRESHOLD),
+        max_entries=dedup_config.get('max_entries', DEFAULT_MAX_ENTRIES)
+    ))
+
+def extract_posting_body(page_text):
+    """
+    Keeps the prose lines of a scraped page (the posting body) and drops navigation,
+    footer and other short lines. Returns '' for login walls and bot checks: short
+    bodies that mention one, or bodies where such lines make up most of the text.
+    """
+    lines = [line.strip() for line in page_text.splitlines()]
+    lines = [line for line in lines if len(line.split()) >= MIN_BODY_LINE_WORDS]
+    words = sum(len(line.split()) for line in lines)
+    blocked_words = sum(len(line.split()) for line in lines if BLOCKED_PAGE_RE.search(line))
+    if not words or (blocked_words and words < BLOCKED_PAGE_WORDS) or blocked_words * 2 > words:
+        return ''
+    return '\n'.join(lines)
+
+def posting_text(config, job_posting_url, job_description):
+    """
+    Returns the text a posting is fingerprinted by: the job description when given,
+    otherwise the body extracted from the scraped page. Returns '' when the page could
+    not be scraped (including offline-mode cache misses). Scrapes go through the tool
+    cache, so the job analyzer reuses the page when it runs.
+    """
+    if job_description:
+        return job_description
+    if not job_posting_url:
+        return ''
+    _, scrape_tool = create_web_tools(config)
+    try:
+        if hasattr(scrape_tool, 'fetch'):
+            page_text = scrape_tool.fetch(website_url=job_posting_url)
+        else:
+            page_text = scrape_tool._run(website_url=job_posting_url)
+    except Exception as e:
+        print(f"Could not scrape {job_posting_url} for duplicate detection: {e}")
+        return ''
+    return extract_posting_body(str(page_text)) if page_text else ''
+
+def reuse_job_analysis(config, job_analysis_task, text, job_posting_url=''):
+    """
+    Looks up a near-duplicate of the posting whose text (see posting_text) is given
+    among earlier runs.
+
+    Returns the earlier job analysis on a hit. On a miss returns None and sets a callback
+    on job_analysis_task that stores its output for later postings.
+    """
+    store = get_posting_store(config)
+    if store is None:
+        return None
+
+    signature = minhash(text)
+    if signature is None:
+        print("Posting text too short or unavailable for duplicate detection, running job analysis")
+        return None
+
+    match = store.find(signature)
+    record('posting_dedup', 'cache', cache_hit=match is not None, similarity=match[1] if match else None)
+    if match:
+        analysis, score, matched_url = match
+        store.count(hit=True)
+        print(f"Reusing job analysis of a near-duplicate posting ({matched_url or 'no URL'}, similarity {score:.2f})")
+        return analysis
+
+    store.count(hit=False)
+    print("No near-duplicate posting found, running job analysis")
+
+    def store_analysis(output):
+        store.add(signature, job_posting_url, output_text(output))
+
+    job_analysis_task.callback = store_analysis
+    return None
+
+def print_dedup_summary(config):
+    store = get_posting_store(config)
+    if store is None or not (store.hits or store.misses):
+        return
+    total = store.hits + store.misses
+    print(f"Job analyses reused from near-duplicate postings: {store.hits}/{total} (threshold {store.threshold})")
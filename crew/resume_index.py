@@ -0,0 +1,178 @@
+import json
+import os
+import re
+import numpy as np
+from typing import Any, Type
+from pydantic import BaseModel, Field
+from crewai_tools import BaseTool
+from .stores import file_hash, get_shared, text_hash
+from .tracing import record, span
+
+DEFAULT_INDEX_DIR = os.path.join(".cache", "resume_index")
+DEFAULT_EMBEDDING = {"service": "openai", "model": "text-embedding-3-small"}
+CHUNK_SIZE = 1000
+
+def split_resume(content, chunk_size=CHUNK_SIZE):
+    """
+    Splits a markdown resume into chunks along its headings, then along paragraphs
+    for sections longer than chunk_size. Each chunk keeps its section heading so that
+    unchanged sections hash to the same chunks across resume edits.
+    """
+    sections = re.split(r'(?m)^(?=#{1,6}\s)', content)
+    chunks = []
+    for section in sections:
+        section = section.strip()
+        if not section:
+            continue
+        heading = section.splitlines()[0] if section.startswith('#') else ''
+        current = ''
+        for paragraph in re.split(r'\n\s*\n', section):
+            if current and len(current) + len(paragraph) > chunk_size:
+                chunks.append(current.strip())
+                current = heading + '\n' if heading and not paragraph.startswith(heading) else ''
+            current += paragraph + '\n\n'
+        if current.strip():
+            chunks.append(current.strip())
+    return chunks
+
+def get_embeddings(embedding_config):
+    service = embedding_config['service']
+    model = embedding_config['model']
+
+    if service == 'openai':
+        from langchain_openai import OpenAIEmbeddings
+        return OpenAIEmbeddings(model=model)
+    elif service == 'google':
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        return GoogleGenerativeAIEmbeddings(model=model)
+    elif service == 'fake':
+        # Offline stand-in for benchmarks: deterministic hash-based vectors
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+        return DeterministicFakeEmbedding(size=int(model))
+    else:
+        raise ValueError(f"Unsupported embedding service: {service}")
+
+class ResumeIndex:
+    """
+    On-disk vector index of a resume, stored per embedding model.
+
+    Layout of <index_dir>/<service>_<model>/:
+    - vectors.npy: one row per chunk ever embedded with this model (memory-mapped on load)
+    - chunks.json: chunk hash -> {"row", "text"}
+    - resumes.json: resume content hash -> ordered list of chunk hashes
+
+    A resume whose hash is already known is loaded without any embedding calls. An edited
+    resume only embeds the chunks whose text changed.
+    """
+
+    def __init__(self, resume_path, embedding_config=None, index_dir=DEFAULT_INDEX_DIR):
+        self.resume_path = resume_path
+        self.embedding_config = embedding_config or DEFAULT_EMBEDDING
+        model_slug = re.sub(r'[^\w.-]', '_', f"{self.embedding_config['service']}_{self.embedding_config['model']}")
+        self.model_dir = os.path.join(index_dir, model_slug)
+        self.resume_hash = file_hash(resume_path)
+        self.texts = []
+        self.vectors = None
+
+    def _path(self, name):
+        return os.path.join(self.model_dir, name)
+
+    def _load_json(self, name):
+        path = self._path(name)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _write_json(self, name, data):
+        tmp_path = self._path(name) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self._path(name))
+
+    def build(self):
+        os.makedirs(self.model_dir, exist_ok=True)
+        chunks = self._load_json('chunks.json')
+        resumes = self._load_json('resumes.json')
+        vectors_path = self._path('vectors.npy')
+
+        chunk_hashes = resumes.get(self.resume_hash)
+        if chunk_hashes is None:
+            with open(self.resume_path, 'r', encoding='utf-8') as f:
+                texts = split_resume(f.read())
+            chunk_hashes = [text_hash(text) for text in texts]
+
+            missing = [(h, t) for h, t in zip(chunk_hashes, texts) if h not in chunks]
+            if missing:
+                record('resume_index', 'embedding', embedded_chunks=len(missing), total_chunks=len(texts))
+                print(f"Embedding {len(missing)} of {len(texts)} resume chunks...")
+                new_vectors = np.asarray(
+                    get_embeddings(self.embedding_config).embed_documents([t for _, t in missing]),
+                    dtype=np.float32
+                )
+                if os.path.exists(vectors_path):
+                    new_vectors = np.concatenate([np.load(vectors_path), new_vectors])
+                first_row = len(new_vectors) - len(missing)
+                for offset, (h, t) in enumerate(missing):
+                    chunks[h] = {"row": first_row + offset, "text": t}
+                tmp_path = self._path('vectors.tmp.npy')
+                np.save(tmp_path, new_vectors)
+                os.replace(tmp_path, vectors_path)
+                self._write_json('chunks.json', chunks)
+
+            resumes[self.resume_hash] = chunk_hashes
+            self._write_json('resumes.json', resumes)
+
+        all_vectors = np.load(vectors_path, mmap_mode='r')
+        rows = [chunks[h]["row"] for h in chunk_hashes]
+        self.texts = [chunks[h]["text"] for h in chunk_hashes]
+        self.vectors = np.asarray(all_vectors[rows])
+        norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        self.vectors = self.vectors / np.where(norms == 0, 1, norms)
+        return self
+
+    def search(self, query, top_k=4):
+        query_vector = np.asarray(get_embeddings(self.embedding_config).embed_query(query), dtype=np.float32)
+        query_vector = query_vector / (np.linalg.norm(query_vector) or 1)
+        scores = self.vectors @ query_vector
+        best = np.argsort(-scores)[:top_k]
+        return [self.texts[i] for i in best]
+
+def get_resume_index(resume_path, config):
+    index_config = config.get('resume_index', {})
+    embedding_config = index_config.get('embedding', DEFAULT_EMBEDDING)
+    index_dir = index_config.get('dir', DEFAULT_INDEX_DIR)
+    key = (os.path.abspath(resume_path), file_hash(resume_path), embedding_config['service'], embedding_config['model'])
+
+    def build():
+        with span('resume_index', 'embedding', model=embedding_config['model']):
+            return ResumeIndex(resume_path, embedding_config, index_dir).build()
+
+    # Loaded indexes are shared by every agent and every batch job in the process
+    return get_shared('resume_index', key, build)
+
+class ResumeSearchToolSchema(BaseModel):
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the resume's content")
+
+class ResumeSearchTool(BaseTool):
+    name: str = "Search the resume's content"
+    description: str = "A tool that can be used to semantic search a query from the candidate's resume content."
+    args_schema: Type[BaseModel] = ResumeSearchToolSchema
+    index: Any = None
+    top_k: int = 4
+
+    def _run(self, search_query: str, **kwargs: Any) -> Any:
+        results = self.index.search(search_query, top_k=self.top_k)
+        return "\n\n---\n\n".join(results)
+
+def create_resume_search_tool(resume_path, config):
+    """
+    Returns the semantic resume search tool. Uses the persistent index unless
+    `resume_index.enabled` is false in the config, in which case it falls back to MDXSearchTool.
+    """
+    index_config = config.get('resume_index', {})
+    if not index_config.get('enabled', True):
+        from crewai_tools import MDXSearchTool
+        return MDXSearchTool(mdx=resume_path)
+
+    return ResumeSearchTool(index=get_resume_index(resume_path, config), top_k=index_config.get('top_k', 4))
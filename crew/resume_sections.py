@@ -0,0 +1,62 @@
+import re
+from typing import Any, Dict, Type
+from pydantic import BaseModel, Field
+from crewai_tools import BaseTool
+
+def split_sections(content):
+    """
+    Splits a markdown resume into {section_id: text} along its headings. Section IDs are
+    slugs of the heading path, e.g. "experience/senior-software-engineer-acme-corp".
+    Text before the first heading, and a single top-level title heading such as the
+    candidate's name, form the "header" section.
+    """
+    lines = content.splitlines()
+    title_only = sum(1 for line in lines if re.match(r'^#\s', line)) == 1
+    sections = {}
+    path = []
+    current_id = 'header'
+    for line in lines:
+        heading = re.match(r'^(#{1,6})\s+(.*)', line)
+        if heading and not (title_only and len(heading.group(1)) == 1):
+            level = len(heading.group(1))
+            slug = re.sub(r'[^a-z0-9]+', '-', heading.group(2).lower()).strip('-')
+            path = path[:level - 1] + [slug]
+            current_id = '/'.join(part for part in path if part)
+        sections.setdefault(current_id, []).append(line)
+    return {section_id: '\n'.join(lines).strip() for section_id, lines in sections.items() if ''.join(lines).strip()}
+
+class ResumeSectionToolSchema(BaseModel):
+    section_id: str = Field(
+        "", description="ID of the resume section to read. Leave empty to list the available section IDs."
+    )
+
+class ResumeSectionTool(BaseTool):
+    name: str = "Read a resume section"
+    description: str = (
+        "A tool that reads one section of the candidate's resume by ID. Call it with an empty "
+        "section_id to list the section IDs, then read only the sections you need."
+    )
+    args_schema: Type[BaseModel] = ResumeSectionToolSchema
+    sections: Dict[str, str] = {}
+
+    def _run(self, section_id: str = "", **kwargs: Any) -> Any:
+        section_id = section_id.strip().strip('/')
+        if section_id in self.sections:
+            return self.sections[section_id]
+        # Reading a parent ID returns all of its subsections
+        children = [text for key, text in self.sections.items() if key.startswith(section_id + '/')] if section_id else []
+        if children:
+            return '\n\n'.join(children)
+        return "Available resume sections:\n" + '\n'.join(self.sections)
+
+def create_resume_read_tool(resume_path, config):
+    """
+    Returns the tool agents use to read the resume: section-level reads when
+    `context_budget.enabled` is true in the config, otherwise a whole-file FileReadTool.
+    """
+    if not config.get('context_budget', {}).get('enabled', False):
+        from crewai_tools import FileReadTool
+        return FileReadTool(file_path=resume_path)
+
+    with open(resume_path, 'r', encoding='utf-8') as f:
+        return ResumeSectionTool(sections=split_sections(f.read()))
@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, List, Optional
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatResult
+from .stores import get_shared
+from .tracing import record
+
+DEFAULT_TIMEOUT = 120
+DEFAULT_WINDOW = 50
+MIN_SAMPLES = 5
+MAX_ERROR_RATE = 0.5
+
+# Candidate calls run here so they can be timed out and hedged. Timed-out calls
+# can't be cancelled and finish in the background.
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='llm-route')
+
+class ProviderStats:
+    """
+    Rolling window of (latency, ok) samples for one (service, model), shared by every
+    routed agent in the process.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, latency, ok):
+        with self._lock:
+            self.samples.append((latency, ok))
+
+    def error_rate(self):
+        with self._lock:
+            if len(self.samples) < MIN_SAMPLES:
+                return 0.0
+            return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    def latency_percentile(self, percentile):
+        with self._lock:
+            latencies = sorted(latency for latency, ok in self.samples if ok)
+        if len(latencies) < MIN_SAMPLES:
+            return None
+        return latencies[min(len(latencies) - 1, int(percentile * len(latencies)))]
+
+def get_stats(name):
+    return get_shared('provider_stats', name, ProviderStats)
+
+class RoutedChatModel(BaseChatModel):
+    """
+    Chat model that routes each call over an ordered list of candidate models.
+
+    - Candidates whose recent error rate is at or above MAX_ERROR_RATE are tried last.
+      With strategy "fastest", healthy candidates are ordered by median latency instead
+      of their configured order.
+    - Each attempt gets `timeout` seconds; on error or timeout the next candidate is tried.
+    - With `hedge_percentile` set, if the first attempt is still running after that
+      percentile of its recent latencies, the next candidate is started as well and the
+      first successful response wins.
+    """
+
+    candidates: List[Any]
+    names: List[str]
+    timeout: float = DEFAULT_TIMEOUT
+    hedge_percentile: Optional[float] = None
+    strategy: str = "ordered"
+
+    @property
+    def _llm_type(self) -> str:
+        return "routed"
+
+    def _ranked(self):
+        def key(index):
+            stats = get_stats(self.names[index])
+            unhealthy = stats.error_rate() >= MAX_ERROR_RATE
+            if self.strategy == 'fastest':
+                median = stats.latency_percentile(0.5)
+                return (unhealthy, median if median is not None else 0.0, index)
+            return (unhealthy, index)
+        return sorted(range(len(self.candidates)), key=key)
+
+    def _call_candidate(self, index, messages, stop, kwargs, timed_out):
+        # A call that outlives its deadline was already recorded as a failure, so its
+        # late result doesn't count as a success
+        stats = get_stats(self.names[index])
+        start = time.perf_counter()
+        try:
+            result = self.candidates[index].generate([messages], stop=stop, **kwargs)
+        except Exception:
+            if not timed_out.is_set():
+                stats.add(time.perf_counter() - start, False)
+            raise
+        if not timed_out.is_set():
+            stats.add(time.perf_counter() - start, True)
+        return ChatResult(generations=result.generations[0], llm_output=result.llm_output)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        order = self._ranked()
+        pending = {}
+        next_position = 0
+        last_error = None
+
+        def launch():
+            nonlocal next_position
+            index = order[next_position]
+            next_position += 1
+            timed_out = threading.Event()
+            pending[_executor.submit(self._call_candidate, index, messages, stop, kwargs, timed_out)] = (index, timed_out)
+            return time.monotonic() + self.timeout
+
+        deadline = launch()
+        hedge_at = None
+        if self.hedge_percentile and len(order) > 1:
+            hedge_delay = get_stats(self.names[order[0]]).latency_percentile(self.hedge_percentile)
+            if hedge_delay is not None:
+                hedge_at = time.monotonic() + hedge_delay
+
+        while pending:
+            wake_at = min(deadline, hedge_at) if hedge_at else deadline
+            done, _ = wait(pending, timeout=max(0, wake_at - time.monotonic()), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index, _ = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    record('llm_route', 'llm', candidate=self.names[index], fallback=True, error=str(e))
+                    last_error = e
+
+            if not done and hedge_at and time.monotonic() >= hedge_at:
+                # First attempt is slower than usual: race it against the next candidate
+                hedge_at = None
+                if next_position < len(order):
+                    record('llm_route', 'llm', candidate=self.names[order[next_position]], hedge=True)
+                    deadline = max(deadline, launch())
+                continue
+
+            if not done and time.monotonic() >= deadline:
+                for index, timed_out in pending.values():
+                    timed_out.set()
+                    get_stats(self.names[index]).add(self.timeout, False)
+                    record('llm_route', 'llm', candidate=self.names[index], fallback=True, error='timeout')
+                last_error = TimeoutError(f"LLM call timed out after {self.timeout}s")
+                pending.clear()
+
+            if not pending and next_position < len(order):
+                hedge_at = None
+                deadline = launch()
+
+        raise last_error or RuntimeError("No LLM candidates available")
+
+def create_routed_llm(llm_config, create_candidate):
+    """
+    Builds a RoutedChatModel from an agent_llms entry with a `candidates` list.
+    create_candidate(candidate_config) returns the chat model for one candidate.
+    """
+    candidates = llm_config['candidates']
+    return RoutedChatModel(
+        candidates=[create_candidate(candidate) for candidate in candidates],
+        names=[f"{candidate['service']}:{candidate['model']}" for candidate in candidates],
+        timeout=llm_config.get('timeout', DEFAULT_TIMEOUT),
+        hedge_percentile=llm_config.get('hedge_percentile'),
+        strategy=llm_config.get('strategy', 'ordered'),
+    )
@@ -0,0 +1,125 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from crewai import Crew
+from .checkpoints import get_checkpoint_store, restore_task_output, task_fingerprint, task_output_text
+from .context_budget import budget_context, get_context_budgets
+from .tracing import record, span
+
+def build_task_graph(tasks):
+    """
+    Returns {task index: set of indices it depends on}, built from each task's `context`.
+    Context tasks that are not part of `tasks` are ignored.
+    """
+    indices = {id(task): i for i, task in enumerate(tasks)}
+    graph = {}
+    for i, task in enumerate(tasks):
+        dependencies = {indices[id(dep)] for dep in (task.context or []) if id(dep) in indices}
+        if any(dep >= i for dep in dependencies):
+            raise ValueError(f"Task {i} depends on a task that comes after it")
+        graph[i] = dependencies
+    return graph
+
+def copy_agents(agents):
+    """
+    Returns {id of agent: copy of agent} for one crew. A kickoff sets the crew, callbacks
+    and executor on its agents, so crews running at the same time each get their own
+    copies; the model and tool objects are shared.
+    """
+    return {id(agent): agent.model_copy(update={'tools': list(agent.tools or [])}) for agent in agents}
+
+def run_task_graph(agents, tasks, inputs, max_workers=None, verbose=True, checkpoints=None, context_budgets=None, context_exempt=(), reuse=None, posting_hash=None):
+    """
+    Runs tasks as a dependency graph instead of a strict sequence.
+
+    Each task starts as soon as every task in its `context` has finished, so independent
+    tasks (e.g. the emphasis and cover letter tasks) run concurrently. Every task is
+    kicked off in its own single-task Crew with copies of all agents, which keeps
+    delegation working without crews sharing agent state, and lets the task read its
+    context tasks' outputs as usual.
+
+    With a CheckpointStore, a task whose fingerprint (prompt, model, inputs, posting
+    content given by posting_hash, resume and upstream outputs) matches an earlier run
+    reuses that output instead of running.
+
+    With context_budgets ({task index: max tokens}), each task's context is fitted to
+    its budget before it runs; the outputs of tasks in context_exempt are passed in full.
+
+    With reuse ({task index: output text}), those tasks take the given output instead
+    of running, e.g. a job analysis reused from a near-duplicate posting.
+
+    Returns the result of the last task in `tasks`, like Crew.kickoff.
+    """
+    graph = build_task_graph(tasks)
+    exempt = [tasks[i] for i in context_exempt]
+    results = {}
+    pending = set(graph)
+    running = {}
+
+    def run_one(i):
+        task = tasks[i]
+        fingerprint = None
+        if reuse and i in reuse:
+            raw = reuse[i]
+        else:
+            fingerprint = task_fingerprint(task, inputs, posting_hash) if checkpoints else None
+            raw = checkpoints.get(fingerprint) if fingerprint else None
+            if raw is not None:
+                print(f"Reusing checkpointed output for task: {task.agent.role}")
+                record(task.agent.role, 'task', cache_hit=True)
+
+        if raw is not None:
+            restore_task_output(task, raw)
+            result = raw
+        else:
+            context, agent = task.context, task.agent
+            if context_budgets and context:
+                task.context = budget_context(task, context_budgets[i], exempt)
+            crew_agents = copy_agents(agents)
+            task.agent = crew_agents.get(id(agent), agent)
+            crew = Crew(agents=list(crew_agents.values()), tasks=[task], verbose=verbose)
+            try:
+                with span(agent.role, 'task'):
+                    result = crew.kickoff(inputs=inputs)
+            finally:
+                task.context, task.agent = context, agent
+            if fingerprint:
+                checkpoints.put(fingerprint, task, task_output_text(task) or str(result))
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks)) as executor:
+        while pending or running:
+            for i in sorted(pending):
+                if graph[i] <= results.keys():
+                    running[executor.submit(run_one, i)] = i
+                    pending.discard(i)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                # Re-raises the task's exception; tasks not yet started are abandoned
+                results[i] = future.result()
+
+    return results[len(tasks) - 1]
+
+def run_crew(agents, tasks, inputs, config, verbose=True, task_names=None, reuse=None, posting_hash=None):
+    """
+    Runs the crew, concurrently along task dependencies unless `concurrent_tasks` is
+    false in the config. Checkpoints and context budgets also go through the task graph
+    (one task at a time when not concurrent), as do tasks whose output is given in
+    `reuse`; otherwise a sequential run is a single Crew.
+
+    task_names names the tasks for per-task settings such as `context_budget.per_task`.
+    posting_hash identifies the posting's content for checkpoint fingerprints.
+    """
+    concurrent = config.get('concurrent_tasks', True)
+    checkpoints = get_checkpoint_store(config)
+    context_budgets, context_exempt = get_context_budgets(config, task_names or [str(i) for i in range(len(tasks))]) or (None, ())
+    with span('crew_kickoff', 'crew', concurrent=concurrent):
+        if not concurrent and checkpoints is None and context_budgets is None and not reuse:
+            crew = Crew(agents=agents, tasks=tasks, verbose=verbose)
+            return crew.kickoff(inputs=inputs)
+
+        return run_task_graph(
+            agents, tasks, inputs,
+            max_workers=None if concurrent else 1, verbose=verbose,
+            checkpoints=checkpoints, context_budgets=context_budgets, context_exempt=context_exempt, reuse=reuse, posting_hash=posting_hash
+        )
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# Open stores (caches, indexes, memories), pooled clients and other process-wide
+# state are shared by every agent and every batch job, keyed by kind and key
+_shared = {}
+_shared_lock = threading.Lock()
+# One lock per key being created, so a slow create() (e.g. embedding a resume)
+# doesn't hold up lookups of other keys
+_creating = {}
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def get_shared(kind, key, create):
+    """
+    Returns the process-wide instance for (kind, key), calling create() the first time.
+    Concurrent first calls for the same key wait for one create() instead of repeating it.
+    """
+    with _shared_lock:
+        if (kind, key) in _shared:
+            return _shared[(kind, key)]
+        key_lock = _creating.setdefault((kind, key), threading.Lock())
+
+    with key_lock:
+        with _shared_lock:
+            if (kind, key) in _shared:
+                return _shared[(kind, key)]
+        value = create()
+        with _shared_lock:
+            _shared[(kind, key)] = value
+            _creating.pop((kind, key), None)
+        return value
+
+def connect(path):
+    """
+    Opens a SQLite database that the calling store shares across threads under its own lock.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    return sqlite3.connect(path, check_same_thread=False)
+
+def remove_file(path):
+    # Another worker or process may have removed it already
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def evict_files(directory, max_entries, suffix='', max_age=None):
+    """
+    LRU eviction for file caches whose entries' modification times are touched on use:
+    deletes files in directory ending with suffix that are older than max_age seconds,
+    and all but the max_entries most recently used.
+    """
+    if not os.path.isdir(directory):
+        return
+    now = time.time()
+    entries = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(suffix) or not entry.is_file():
+            continue
+        try:
+            mtime = entry.stat().st_mtime
+        except OSError:
+            continue
+        if max_age is not None and mtime < now - max_age:
+            remove_file(entry.path)
+        else:
+            entries.append((mtime, entry.path))
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        remove_file(path)
+
+def evict_lru(conn, table, max_entries, order_by='last_access', where='', params=()):
+    """
+    Deletes all but the max_entries rows of table (optionally only those matching the
+    `where` clause) with the highest order_by value. Does not commit.
+    """
+    where_clause = f"WHERE {where}" if where else ''
+    conn.execute(
+        f"DELETE FROM {table} WHERE rowid IN ("
+        f"SELECT rowid FROM {table} {where_clause} ORDER BY {order_by} DESC LIMIT -1 OFFSET ?)",
+        (*params, max_entries)
+    )
@@ -0,0 +1,256 @@
+import re
+from typing import List
+from pydantic import BaseModel, Field
+
+class Contact(BaseModel):
+    full_name: str
+    email: str = ""
+    linkedin_profile: str = Field("", description="LinkedIn handle only, without the URL prefix")
+    phone: str = ""
+    city: str = ""
+    state: str = ""
+
+class Education(BaseModel):
+    degree: str
+    major: str = ""
+    university: str
+    start_date: str = ""
+    end_date: str = ""
+    courses: List[str] = []
+
+class SkillCategory(BaseModel):
+    skill_category: str
+    skills: List[str]
+
+class Job(BaseModel):
+    job_title: str
+    company_name: str
+    company_website: str = ""
+    city: str = ""
+    state: str = ""
+    start_date: str = ""
+    end_date: str = ""
+    achievements: List[str] = Field(description="Bullet points, most relevant first. Wrap keywords in **bold**.")
+
+class Project(BaseModel):
+    project_name: str
+    descriptions: List[str] = Field(description="Bullet points, most relevant first. Wrap keywords in **bold**.")
+
+class StructuredResume(BaseModel):
+    contact: Contact
+    education: List[Education]
+    skills: List[SkillCategory]
+    jobs: List[Job]
+    projects: List[Project]
+
+# Real LaTeX version of the template in the emphasis task. Repeatable sections are
+# marked with [[name_start]]/[[name_end]] ([[name_start|separator]] puts separator
+# between items), values with <<placeholder>> and URL values with <<url:placeholder>>.
+# [[if_field_start]]/[[if_field_end]] keeps its content only when field has a value,
+# [[unless_field_start]]/[[unless_field_end]] only when it is empty.
+RESUME_TEMPLATE = r"""\documentclass{resume}
+\usepackage[implicit=false]{hyperref}
+\usepackage{array}
+\usepackage{enumitem}
+\setlist{topsep=-3pt, itemsep=-3pt}
+\usepackage[left=0.45in,top=0.4in,right=0.45in,bottom=0.4in]{geometry}
+\newcommand{\tab}[1]{\hspace{.2667\textwidth}\rlap{#1}}
+\newcommand{\MYhref}[3][blue]{\href{#2}{\color{#1}{#3}}}
+\newcommand{\itab}[1]{\hspace{0em}\rlap{#1}}
+
+\name{<<full_name>>}
+\address{[[contact_item_start| \\ ]][[if_email_start]]\href{mailto:<<url:email>>}{<<email>>}[[if_email_end]][[if_linkedin_profile_start]]\href{https://www.linkedin.com/in/<<url:linkedin_profile>>}{www.linkedin.com/in/<<linkedin_profile>>}[[if_linkedin_profile_end]][[if_phone_start]]\href{tel:<<url:phone>>}{<<phone>>}[[if_phone_end]][[if_location_start]]<<location>>[[if_location_end]][[contact_item_end]]}
+
+\begin{document}
+
+%----------------------------------------------------------------------------------------
+%	EDUCATION SECTION
+%----------------------------------------------------------------------------------------
+\begin{rSection}{Education}
+
+[[education_start]]
+{\bf <<degree>>[[if_major_start]], <<major>>[[if_major_end]]} $|$ <<university>> \hfill <<dates>>[[if_courses_start]] \\
+{\bf Courses:} <<courses>>[[if_courses_end]]
+
+
+\vspace{0.5pt}
+[[education_end]]
+
+\end{rSection}
+
+%----------------------------------------------------------------------------------------
+% TECHNICAL STRENGTHS
+%----------------------------------------------------------------------------------------
+\begin{rSection}{SKILLS}
+
+\begin{tabular}{ @{} >{\bfseries}l @{\hspace{6ex}} l }
+[[skill_category_start]]
+<<skill_category>> & <<skills>> \\
+[[skill_category_end]]
+\end{tabular}
+
+\end{rSection}
+
+%----------------------------------------------------------------------------------------
+%	WORK EXPERIENCE SECTION
+%----------------------------------------------------------------------------------------
+\begin{rSection}{EXPERIENCE}
+
+[[job_start]]
+\textbf{<<job_title>>}, [[if_company_website_start]]\href{<<url:company_website>>}{<<company_name>>}[[if_company_website_end]][[unless_company_website_start]]<<company_name>>[[unless_company_website_end]][[if_location_start]] - <<location>>[[if_location_end]] \hfill <<dates>>
+[[if_achievements_start]]
+\begin{itemize}
+    [[achievement_start]]
+    \item <<achievement>>
+    [[achievement_end]]
+\end{itemize}
+[[if_achievements_end]]
+
+[[job_end]]
+
+\end{rSection}
+
+\begin{rSection}{PROJECTS}
+
+[[project_start]]
+\textbf{<<project_name>>}
+[[if_descriptions_start]]
+\begin{itemize}
+    [[description_start]]
+    \item <<description>>
+    [[description_end]]
+\end{itemize}
+[[if_descriptions_end]]
+
+[[project_end]]
+
+\end{rSection}
+
+\end{document}
+"""
+
+# Template section name -> list field holding its items
+SECTIONS = {
+    'contact_item': 'contact_items',
+    'education': 'education',
+    'skill_category': 'skills',
+    'job': 'jobs',
+    'achievement': 'achievements',
+    'project': 'projects',
+    'description': 'descriptions',
+}
+
+# Matches either a whole repeatable section or a single placeholder, so one pass fills
+# each level of the template without re-scanning already rendered text
+TEMPLATE_RE = re.compile(
+    r'(?:^[ \t]*)?\[\[(?P<section>\w+)_start(?:\|(?P<separator>[^\]]*))?\]\]\n?(?P<body>.*?)[ \t]*\[\[(?P=section)_end\]\]\n?'
+    r'|<<(?P<url>url:)?(?P<placeholder>\w+)>>',
+    re.DOTALL | re.MULTILINE
+)
+
+LATEX_SPECIAL_CHARS = {
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+}
+
+def escape_latex(text):
+    """
+    Escapes LaTeX special characters in plain text and turns markdown **bold** into \\textbf.
+    """
+    escaped = ''.join(LATEX_SPECIAL_CHARS.get(char, char) for char in str(text))
+    return re.sub(r'\*\*(.+?)\*\*', r'\\textbf{\1}', escaped)
+
+# Characters that break a URL in \\href: TeX specials are escaped the way hyperref
+# expects, the rest are percent-encoded
+LATEX_URL_CHARS = {
+    '%': r'\%',
+    '#': r'\#',
+    '\\': '%5C',
+    '{': '%7B',
+    '}': '%7D',
+    '~': '%7E',
+    '^': '%5E',
+    '$': '%24',
+    ' ': '%20',
+}
+
+def escape_url(url):
+    """
+    Escapes a URL for the first argument of \\href. Unlike escape_latex it keeps &, _
+    and the URL's structure intact.
+    """
+    return ''.join(LATEX_URL_CHARS.get(char, char) for char in str(url).strip())
+
+def join_present(separator, *values):
+    return separator.join(value for value in values if value)
+
+def render_template(template, context):
+    def fill(match):
+        name = match.group('section')
+        if name is not None:
+            body = match.group('body')
+            for prefix, wanted in (('if_', True), ('unless_', False)):
+                if name.startswith(prefix):
+                    return render_template(body, context) if bool(context.get(name[len(prefix):])) == wanted else ''
+
+            items = context.get(SECTIONS.get(name, name)) or []
+            rendered = []
+            for item in items:
+                item_context = item if isinstance(item, dict) else {name: item}
+                rendered.append(render_template(body, {**context, **item_context}))
+            return (match.group('separator') or '').join(rendered)
+
+        value = context.get(match.group('placeholder'))
+        if value is None:
+            return ''
+        if match.group('url'):
+            return escape_url(value)
+        if isinstance(value, list):
+            return ', '.join(escape_latex(v) for v in value)
+        return escape_latex(value)
+
+    return TEMPLATE_RE.sub(fill, template)
+
+def render_resume_latex(resume, template=RESUME_TEMPLATE):
+    """
+    Deterministically renders a StructuredResume into the LaTeX resume template.
+    Empty optional fields are left out together with their separators.
+    """
+    data = resume.model_dump()
+    contact = data.pop('contact')
+    contact['location'] = join_present(', ', contact['city'], contact['state'])
+    # One item per contact detail that is present, each with only its own field set,
+    # so the template separates just the details that are shown
+    contact_fields = ['email', 'linkedin_profile', 'phone', 'location']
+    contact['contact_items'] = [
+        {field: contact[field] if field == shown else '' for field in contact_fields}
+        for shown in contact_fields if contact[shown]
+    ]
+    for education in data['education']:
+        education['dates'] = join_present(' - ', education['start_date'], education['end_date'])
+    for job in data['jobs']:
+        job['location'] = join_present(', ', job['city'], job['state'])
+        job['dates'] = join_present(' - ', job['start_date'], job['end_date'])
+
+    context = {**contact, **data}
+    return render_template(template, context)
+
+def load_structured_resume(json_file):
+    """
+    Loads and validates the emphasis task's JSON output, tolerating a ```json fence around it.
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    match = re.search(r"```(?:json)?(.*?)```", content, re.DOTALL)
+    if match:
+        content = match.group(1)
+    return StructuredResume.model_validate_json(content.strip())
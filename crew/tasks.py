@@ -1,7 +1,13 @@
 import argparse
+import os
 from crewai import Task
+from .structured_resume import StructuredResume
+
+def create_tasks(job_analyzer, relevance_selector, emphasis_strategist, cover_letter_writer, output_dir=None, structured_resume=False):
+    # Write outputs into output_dir when given (batch runs), otherwise the CWD
+    def output_path(file_name):
+        return os.path.join(output_dir, file_name) if output_dir else file_name
 
-def create_tasks(job_analyzer, relevance_selector, emphasis_strategist, cover_letter_writer):
     job_analysis_task = Task(
         description=(
             "Analyze the job posting URL provided ({job_posting_url}) "
@@ -40,131 +46,158 @@ def create_tasks(job_analyzer, relevance_selector, emphasis_strategist, cover_le
 
         ),
         agent=relevance_selector,
-        output_file="resume.md",
+        output_file=output_path("resume.md"),
         context=[job_analysis_task]
     )
 
 
 
 
-    emphasis_task = Task(
-        description=(
-        "Utilize all the data provided by the user and fill in all the data generated in the new resume into the provided "
-        "LaTeX template. Replace the placeholders marked with << >> with the appropriate information. "
-        "The [[tag]] markers indicate the beginning and end of repeatable sections. "
-        "Ensure that bullet points start with strong action verbs and quantify achievements where possible. "
-        "Bold all keywords that align with the job description to help recruiters quickly analyze the resume. "
-        "Maintain consistency in style and verb tense throughout the document. "
-        "Include all relevant certifications, courses, and educational qualifications. "
-        "Ensure the resume is ATS-friendly by keeping the formatting simple and avoiding complex layouts. "
-        "Proofread the final document for spelling and grammatical errors."
-        ),
-        expected_output=(
-            r"""A LaTeX formatted output which has all the details for the generated resume on the following LaTeX format:
-            
-            \documentclass[resume]
-            \usepackage[implicit=false][hyperref]
-            \usepackage[enumitem]
-            \setlist[topsep=-3pt, itemsep=-3pt]
-            \usepackage[left=0.45in,top=0.4in,right=0.45in,bottom=0.4in][geometry]
-            \newcommand[\tab][1][\hspace[.2667\textwidth]\rlap[#1]]
-            \newcommand[\MYhref][3][blue][\href#2][\color[#1][#3]]]
-            \newcommand[\itab][1][\hspace[0em]\rlap[#1]]
-
-
-            \name\Large <<full_name>>
-            \address\href[mailto:<<email>>]<<email>> \\ \href[https://www.linkedin.com/in/<<linkedin_profile>>]www.linkedin.com/in/<<linkedin_profile>> \\ 
-            \href[tel:<<phone>>]<<phone>> \\ <<city>>, <<state>>
-
-            \begin[document]
-
-            %----------------------------------------------------------------------------------------
-            %	EDUCATION SECTION
-            %----------------------------------------------------------------------------------------
-            \begin[rSection]Education
-
-            [[education_start]]
-            \bf <<degree>>, <<major>> $|$ <<university>> \hfill <<start_date>> - <<end_date>> \\
-            \bf Courses:  <<courses>>
-
-            \vspace0.5pt
-            [[education_end]]
-
-            \end[rSection]
-
-            %----------------------------------------------------------------------------------------
-            % TECHNICAL STRENGTHS	
-            %----------------------------------------------------------------------------------------
-            \begin[rSection]SKILLS
-
-            \begin[tabular][ @[] >\bfseriesl @\hspace[6ex] l ]
-            [[skill_category_start]]
-            <<skill_category>> & <<skills>> \\
-            [[skill_category_end]]
-            \end[tabular]
-
-            \end[rSection]
-
-            %----------------------------------------------------------------------------------------
-            %	WORK EXPERIENCE SECTION
-            %----------------------------------------------------------------------------------------
-            \begin[rSection]EXPERIENCE
-
-            [[job_start]]
-            \textbf<<job_title>>, \href[<<company_website>>]<<company_name>> - <<city>>, <<state>> \hfill <<start_date>> - <<end_date>>
-            \begin[itemize]
-                [[achievement_start]]
-                \item <<achievement>>
-                [[achievement_end]]
-            \end[itemize]
-
-            [[job_end]]
-
-            \end[rSection] 
-
-            \begin[rSection]PROJECTS
-
-            [[project_start]]
-            \item \textbf<<project_name>>
+    if structured_resume:
+        # Ask for compact JSON instead of a full LaTeX document. The JSON is validated
+        # against StructuredResume and rendered locally by convert_json_to_pdf.
+        emphasis_task = Task(
+            description=(
+            "Utilize all the data provided by the user and fill in all the data generated in the new resume into "
+            "the structured resume format. List bullet points and skills in order of relevance to the job, most relevant first. "
+            "Ensure that bullet points start with strong action verbs and quantify achievements where possible. "
+            "Bold all keywords that align with the job description by wrapping them in **double asterisks**. "
+            "Maintain consistency in style and verb tense throughout the document. "
+            "Include all relevant certifications, courses, and educational qualifications. "
+            "Use plain text only: do not include any LaTeX or markdown other than the ** bold markers. "
+            "Proofread the final document for spelling and grammatical errors."
+            ),
+            expected_output=(
+                "A JSON object with the keys contact (full_name, email, linkedin_profile, phone, city, state), "
+                "education (degree, major, university, start_date, end_date, courses), "
+                "skills (skill_category, skills), "
+                "jobs (job_title, company_name, company_website, city, state, start_date, end_date, achievements) "
+                "and projects (project_name, descriptions)."
+            ),
+            output_pydantic=StructuredResume,
+            output_file=output_path("latex_resume.json"),
+            agent=emphasis_strategist,
+            context=[job_analysis_task, relevance_task]
+        )
+    else:
+        emphasis_task = Task(
+            description=(
+            "Utilize all the data provided by the user and fill in all the data generated in the new resume into the provided "
+            "LaTeX template. Replace the placeholders marked with << >> with the appropriate information. "
+            "The [[tag]] markers indicate the beginning and end of repeatable sections. "
+            "Ensure that bullet points start with strong action verbs and quantify achievements where possible. "
+            "Bold all keywords that align with the job description to help recruiters quickly analyze the resume. "
+            "Maintain consistency in style and verb tense throughout the document. "
+            "Include all relevant certifications, courses, and educational qualifications. "
+            "Ensure the resume is ATS-friendly by keeping the formatting simple and avoiding complex layouts. "
+            "Proofread the final document for spelling and grammatical errors."
+            ),
+            expected_output=(
+                r"""A LaTeX formatted output which has all the details for the generated resume on the following LaTeX format:
+                
+                \documentclass[resume]
+                \usepackage[implicit=false][hyperref]
+                \usepackage[enumitem]
+                \setlist[topsep=-3pt, itemsep=-3pt]
+                \usepackage[left=0.45in,top=0.4in,right=0.45in,bottom=0.4in][geometry]
+                \newcommand[\tab][1][\hspace[.2667\textwidth]\rlap[#1]]
+                \newcommand[\MYhref][3][blue][\href#2][\color[#1][#3]]]
+                \newcommand[\itab][1][\hspace[0em]\rlap[#1]]
+
+
+                \name\Large <<full_name>>
+                \address\href[mailto:<<email>>]<<email>> \\ \href[https://www.linkedin.com/in/<<linkedin_profile>>]www.linkedin.com/in/<<linkedin_profile>> \\ 
+                \href[tel:<<phone>>]<<phone>> \\ <<city>>, <<state>>
+
+                \begin[document]
+
+                %----------------------------------------------------------------------------------------
+                %	EDUCATION SECTION
+                %----------------------------------------------------------------------------------------
+                \begin[rSection]Education
+
+                [[education_start]]
+                \bf <<degree>>, <<major>> $|$ <<university>> \hfill <<start_date>> - <<end_date>> \\
+                \bf Courses:  <<courses>>
+
+                \vspace0.5pt
+                [[education_end]]
+
+                \end[rSection]
+
+                %----------------------------------------------------------------------------------------
+                % TECHNICAL STRENGTHS	
+                %----------------------------------------------------------------------------------------
+                \begin[rSection]SKILLS
+
+                \begin[tabular][ @[] >\bfseriesl @\hspace[6ex] l ]
+                [[skill_category_start]]
+                <<skill_category>> & <<skills>> \\
+                [[skill_category_end]]
+                \end[tabular]
+
+                \end[rSection]
+
+                %----------------------------------------------------------------------------------------
+                %	WORK EXPERIENCE SECTION
+                %----------------------------------------------------------------------------------------
+                \begin[rSection]EXPERIENCE
+
+                [[job_start]]
+                \textbf<<job_title>>, \href[<<company_website>>]<<company_name>> - <<city>>, <<state>> \hfill <<start_date>> - <<end_date>>
                 \begin[itemize]
-                [[description_start]]
-                \item <<description>>
-                [[description_end]]
+                    [[achievement_start]]
+                    \item <<achievement>>
+                    [[achievement_end]]
                 \end[itemize]
 
-            [[project_end]]
-
-            \end[rSection]
-
-            %----------------------------------------------------------------------------------------
-            %	CERTIFICATIONS AND ACHIEVEMENTS SECTION (Optional)
-            %----------------------------------------------------------------------------------------
-            % \begin[rSection]Certifications and achievements
-            % \begin[itemize]
-            %     \item Certification or achievement
-            %     \item Certification or achievement
-            %     \item Certification or achievement
-            % \end[itemize]
-            % \end[rSection]
-
-            %----------------------------------------------------------------------------------------
-            %	LEADERSHIP SECTION (Optional)
-            %----------------------------------------------------------------------------------------
-            % \begin[rSection]Leadership
-            % \begin[itemize]
-            %     \item Leadership experience
-            %     \item Leadership experience
-            %     \item Leadership experience
-            % \end[itemize]
-            % \end[rSection]
-
-            \end[document]
-            """
-        ),
-        output_file="latex_resume.md",
-        agent=emphasis_strategist,
-        context=[job_analysis_task, relevance_task]
-    )
+                [[job_end]]
+
+                \end[rSection] 
+
+                \begin[rSection]PROJECTS
+
+                [[project_start]]
+                \item \textbf<<project_name>>
+                    \begin[itemize]
+                    [[description_start]]
+                    \item <<description>>
+                    [[description_end]]
+                    \end[itemize]
+
+                [[project_end]]
+
+                \end[rSection]
+
+                %----------------------------------------------------------------------------------------
+                %	CERTIFICATIONS AND ACHIEVEMENTS SECTION (Optional)
+                %----------------------------------------------------------------------------------------
+                % \begin[rSection]Certifications and achievements
+                % \begin[itemize]
+                %     \item Certification or achievement
+                %     \item Certification or achievement
+                %     \item Certification or achievement
+                % \end[itemize]
+                % \end[rSection]
+
+                %----------------------------------------------------------------------------------------
+                %	LEADERSHIP SECTION (Optional)
+                %----------------------------------------------------------------------------------------
+                % \begin[rSection]Leadership
+                % \begin[itemize]
+                %     \item Leadership experience
+                %     \item Leadership experience
+                %     \item Leadership experience
+                % \end[itemize]
+                % \end[rSection]
+
+                \end[document]
+                """
+            ),
+            output_file=output_path("latex_resume.md"),
+            agent=emphasis_strategist,
+            context=[job_analysis_task, relevance_task]
+        )
 
     cover_letter_task = Task(
         description=(
@@ -179,7 +212,7 @@ def create_tasks(job_analyzer, relevance_selector, emphasis_strategist, cover_le
             "4. Appropriate tone and style for the industry and company culture\n"
         ),
         agent=cover_letter_writer,
-        output_file="cover_letter.md",
+        output_file=output_path("cover_letter.md"),
         context=[job_analysis_task, relevance_task]
 
     )
@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+import time
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from crewai_tools import SerperDevTool, ScrapeWebsiteTool
+from .stores import connect, evict_lru, get_shared
+from .tracing import record
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "tool_cache.sqlite")
+DEFAULT_SCRAPE_TTL = 24 * 60 * 60
+DEFAULT_SEARCH_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+
+def normalize_url(url):
+    """
+    Normalizes a URL for use as a cache key: lowercases the scheme and host, drops the
+    fragment, tracking parameters and trailing slash, and sorts the query string.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_')
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+def normalize_query(query):
+    return ' '.join(query.lower().split())
+
+class ToolCache:
+    """
+    SQLite-backed key/value cache for tool results with per-entry TTL and LRU eviction.
+
+    Identical lookups that miss at the same time are coalesced: the first caller runs
+    the fetch, the others wait for its result instead of repeating the request.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, offline=False):
+        self.max_entries = max_entries
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._conn = connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT, key TEXT, value TEXT, expires_at REAL, last_access REAL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+
+    def get(self, namespace, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            # Offline mode serves stale entries rather than nothing
+            if expires_at < now and not self.offline:
+                self._conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key)
+            )
+            self._conn.commit()
+        return json.loads(value)
+
+    def set(self, namespace, key, value, ttl):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), now + ttl, now)
+            )
+            self._conn.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+            evict_lru(self._conn, 'entries', self.max_entries)
+            self._conn.commit()
+
+    def get_or_fetch(self, namespace, key, ttl, fetch):
+        """
+        Returns the cached value for key, calling fetch() on a miss. In offline mode a miss
+        returns None without calling fetch.
+        """
+        value = self.get(namespace, key)
+        record(f'{namespace}_cache', 'cache', cache_hit=value is not None)
+        if value is not None or self.offline:
+            return value
+
+        with self._lock:
+            waiter = self._in_flight.get((namespace, key))
+            if waiter is None:
+                self._in_flight[(namespace, key)] = waiter = {'event': threading.Event(), 'value': None, 'error': None}
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            waiter['event'].wait()
+            if waiter['error'] is not None:
+                raise waiter['error']
+            return waiter['value']
+
+        try:
+            waiter['value'] = fetch()
+            self.set(namespace, key, waiter['value'], ttl)
+            return waiter['value']
+        except Exception as e:
+            waiter['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[(namespace, key)]
+            waiter['event'].set()
+
+def get_tool_cache(config):
+    cache_config = config.get('tool_cache', {})
+    path = cache_config.get('path', DEFAULT_CACHE_PATH)
+
+    return get_shared('tool_cache', path, lambda: ToolCache(
+        path,
+        max_entries=cache_config.get('max_entries', DEFAULT_MAX_ENTRIES),
+        offline=cache_config.get('offline', False)
+    ))
+
+class CachedScrapeWebsiteTool(ScrapeWebsiteTool):
+    cache: Any = None
+    ttl: int = DEFAULT_SCRAPE_TTL
+
+    def fetch(self, **kwargs: Any) -> Any:
+        """
+        Returns the page text, or None on an offline-mode cache miss.
+        """
+        website_url = kwargs.get('website_url', self.website_url)
+        return self.cache.get_or_fetch(
+            'scrape', normalize_url(website_url), self.ttl,
+            lambda: super(CachedScrapeWebsiteTool, self)._run(**kwargs)
+        )
+
+    def _run(self, **kwargs: Any) -> Any:
+        website_url = kwargs.get('website_url', self.website_url)
+        result = self.fetch(**kwargs)
+        if result is None:
+            return f"No cached content for {website_url} (tool cache is in offline mode)."
+        return result
+
+class CachedSerperDevTool(SerperDevTool):
+    cache: Any = None
+    ttl: int = DEFAULT_SEARCH_TTL
+
+    def _run(self, **kwargs: Any) -> Any:
+        search_query = kwargs.get('search_query') or kwargs.get('query') or ''
+        key = json.dumps([normalize_query(search_query)] + [getattr(self, name, None) for name in ('n_results', 'country', 'location', 'locale')])
+        result = self.cache.get_or_fetch(
+            'search', key, self.ttl,
+            lambda: super(CachedSerperDevTool, self)._run(**kwargs)
+        )
+        if result is None:
+            return f"No cached search results for '{search_query}' (tool cache is in offline mode)."
+        return result
+
+def create_web_tools(config):
+    """
+    Returns (search_tool, scrape_tool), wrapped in the shared tool cache unless
+    `tool_cache.enabled` is false in the config.
+    """
+    cache_config = config.get('tool_cache', {})
+    if not cache_config.get('enabled', True):
+        return SerperDevTool(), ScrapeWebsiteTool()
+
+    cache = get_tool_cache(config)
+    search_tool = CachedSerperDevTool(cache=cache, ttl=cache_config.get('search_ttl', DEFAULT_SEARCH_TTL))
+    scrape_tool = CachedScrapeWebsiteTool(cache=cache, ttl=cache_config.get('scrape_ttl', DEFAULT_SCRAPE_TTL))
+    return search_tool, scrape_tool
@@ -0,0 +1,267 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from langchain_core.callbacks import BaseCallbackHandler
+
+# USD per 1M (input, output) tokens, matched by longest model name prefix
+MODEL_PRICES = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4-turbo': (10.00, 30.00),
+    'gpt-4': (30.00, 60.00),
+    'gpt-3.5-turbo': (0.50, 1.50),
+    'claude-3-5-sonnet': (3.00, 15.00),
+    'claude-3-opus': (15.00, 75.00),
+    'claude-3-sonnet': (3.00, 15.00),
+    'claude-3-haiku': (0.25, 1.25),
+    'gemini-1.5-pro': (1.25, 5.00),
+    'gemini-1.5-flash': (0.075, 0.30),
+}
+
+# Size at which the JSONL trace is rotated to <path>.1, replacing the previous one
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+def estimate_cost(model, input_tokens, output_tokens):
+    prefixes = [prefix for prefix in MODEL_PRICES if model.startswith(prefix)]
+    if not prefixes:
+        return None
+    input_price, output_price = MODEL_PRICES[max(prefixes, key=len)]
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+class Tracer:
+    """
+    Collects timed spans and instant events and appends them to a JSONL trace.
+
+    Each line has name, cat (category), ts (start, epoch seconds), dur (seconds, 0 for
+    instant events), tid (thread) and any extra attributes such as tokens or cache hits.
+
+    With max_events, only the most recent events are kept in memory (e.g. in a
+    long-running service); the JSONL trace still gets every event. The trace file stays
+    open and buffered until close() (called at exit), and once it reaches max_bytes it
+    is moved to <path>.1 and a new one is started.
+    """
+
+    def __init__(self, path=None, max_events=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._file = open(path, 'a')
+            atexit.register(self.close)
+
+    def emit(self, name, category, start, duration, **attrs):
+        event = {'name': name, 'cat': category, 'ts': start, 'dur': duration, 'tid': threading.get_ident(), **attrs}
+        with self._lock:
+            self.events.append(event)
+            if self._file:
+                self._file.write(json.dumps(event, default=str) + '\n')
+                if self.max_bytes and self._file.tell() >= self.max_bytes:
+                    self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        os.replace(self.path, self.path + '.1')
+        self._file = open(self.path, 'a')
+
+    def flush(self):
+        with self._lock:
+            if self._file:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+# Disabled until configure_tracing is called
+_tracer = None
+
+def configure_tracing(config, max_events=None):
+    """
+    Enables tracing when `tracing.enabled` is true in the config. Returns the tracer or None.
+
+    `tracing.max_events` caps the events kept in memory; max_events is the default when
+    the config doesn't set it. `tracing.max_bytes` sets the size at which the trace file
+    is rotated.
+    """
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+    tracing_config = config.get('tracing', {})
+    if tracing_config.get('enabled', False):
+        _tracer = Tracer(
+            tracing_config.get('path', os.path.join('.cache', 'trace.jsonl')),
+            max_events=tracing_config.get('max_events', max_events),
+            max_bytes=tracing_config.get('max_bytes', DEFAULT_MAX_BYTES)
+        )
+    else:
+        _tracer = None
+    return _tracer
+
+def get_tracer():
+    return _tracer
+
+@contextmanager
+def span(name, category, **attrs):
+    """
+    Times the enclosed block. Yields a dict that the block can add attributes to
+    (e.g. cache_hit). Does nothing when tracing is disabled.
+    """
+    if _tracer is None:
+        yield attrs
+        return
+
+    start = time.time()
+    perf_start = time.perf_counter()
+    try:
+        yield attrs
+    except Exception as e:
+        attrs['error'] = str(e)
+        raise
+    finally:
+        _tracer.emit(name, category, start, time.perf_counter() - perf_start, **attrs)
+
+def record(name, category, **attrs):
+    """
+    Records an instant event such as a cache hit.
+    """
+    if _tracer is not None:
+        _tracer.emit(name, category, time.time(), 0, **attrs)
+
+def trace_tools(tools):
+    """
+    Wraps each tool's _run in a span so tool call latency shows up in the trace.
+    """
+    for tool in tools:
+        if getattr(tool, '_traced', False):
+            continue
+        run = tool._run
+
+        def traced_run(*args, _run=run, _name=tool.name, **kwargs):
+            with span(_name, 'tool'):
+                return _run(*args, **kwargs)
+
+        object.__setattr__(tool, '_run', traced_run)
+        object.__setattr__(tool, '_traced', True)
+    return tools
+
+class TraceCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callback that records one span per LLM call with token counts and
+    estimated cost. Failed calls are recorded with their error; retries inside the provider
+    SDK (`llm_max_retries`) happen within one call and are not counted separately, while
+    routing fallbacks and hedges show up as retries on the `llm_route` row.
+    """
+
+    def __init__(self, service, model):
+        self.service = service
+        self.model = model
+        self._starts = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._starts[run_id] = (time.time(), time.perf_counter())
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._starts[run_id] = (time.time(), time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        start, perf_start = self._starts.pop(run_id, (time.time(), time.perf_counter()))
+        input_tokens, output_tokens = token_usage(response)
+        if _tracer is not None:
+            _tracer.emit(
+                f"{self.service}:{self.model}", 'llm', start, time.perf_counter() - perf_start,
+                service=self.service, model=self.model,
+                input_tokens=input_tokens, output_tokens=output_tokens,
+                cost=estimate_cost(self.model, input_tokens, output_tokens)
+            )
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        start, perf_start = self._starts.pop(run_id, (time.time(), time.perf_counter()))
+        if _tracer is not None:
+            _tracer.emit(
+                f"{self.service}:{self.model}", 'llm', start, time.perf_counter() - perf_start,
+                service=self.service, model=self.model, error=str(error)
+            )
+
+def token_usage(response):
+    llm_output = response.llm_output or {}
+    usage = llm_output.get('token_usage') or llm_output.get('usage') or {}
+    input_tokens = usage.get('prompt_tokens') or usage.get('input_tokens') or 0
+    output_tokens = usage.get('completion_tokens') or usage.get('output_tokens') or 0
+    if input_tokens or output_tokens:
+        return input_tokens, output_tokens
+
+    # Providers that report usage on the message instead of llm_output
+    for generations in response.generations:
+        for generation in generations:
+            usage_metadata = getattr(getattr(generation, 'message', None), 'usage_metadata', None) or {}
+            input_tokens += usage_metadata.get('input_tokens', 0)
+            output_tokens += usage_metadata.get('output_tokens', 0)
+    return input_tokens, output_tokens
+
+def summarize(events):
+    """
+    Aggregates events by (category, name) into count, total time, tokens, cost, cache hits,
+    errors and retries (routing fallbacks and hedges).
+    """
+    rows = {}
+    for event in events:
+        row = rows.setdefault((event['cat'], event['name']), {
+            'count': 0, 'time': 0.0, 'input_tokens': 0, 'output_tokens': 0,
+            'cost': 0.0, 'cache_hits': 0, 'errors': 0, 'retries': 0
+        })
+        row['count'] += 1
+        row['time'] += event['dur']
+        row['input_tokens'] += event.get('input_tokens') or 0
+        row['output_tokens'] += event.get('output_tokens') or 0
+        row['cost'] += event.get('cost') or 0
+        row['cache_hits'] += 1 if event.get('cache_hit') else 0
+        row['errors'] += 1 if event.get('error') else 0
+        row['retries'] += 1 if event.get('fallback') or event.get('hedge') else 0
+    return rows
+
+def print_trace_summary(tracer=None):
+    tracer = tracer or _tracer
+    if tracer is None or not tracer.events:
+        return
+
+    print("\nTrace Summary:")
+    print(f"{'Category':<8} {'Name':<40} {'Calls':>5} {'Time (s)':>9} {'Tokens in':>10} {'Tokens out':>10} {'Cost ($)':>9} {'Hits':>5} {'Errors':>7} {'Retries':>7}")
+    rows = summarize(tracer.events)
+    for (category, name), row in sorted(rows.items(), key=lambda item: -item[1]['time']):
+        print(
+            f"{category:<8} {name[:40]:<40} {row['count']:>5} {row['time']:>9.2f} {row['input_tokens']:>10} "
+            f"{row['output_tokens']:>10} {row['cost']:>9.4f} {row['cache_hits']:>5} {row['errors']:>7} {row['retries']:>7}"
+        )
+    if tracer.path:
+        tracer.flush()
+        print(f"\nFull trace written to {tracer.path}")
+
+def export_chrome_trace(output_path, tracer=None):
+    """
+    Writes the collected events in Chrome trace-event format, viewable in chrome://tracing or Perfetto.
+    """
+    tracer = tracer or _tracer
+    if tracer is None:
+        return
+
+    trace_events = []
+    for event in tracer.events:
+        args = {k: v for k, v in event.items() if k not in ('name', 'cat', 'ts', 'dur', 'tid')}
+        trace_events.append({
+            'name': event['name'], 'cat': event['cat'],
+            'ph': 'X' if event['dur'] else 'i',
+            'ts': event['ts'] * 1_000_000, 'dur': event['dur'] * 1_000_000,
+            'pid': os.getpid(), 'tid': event['tid'], 'args': args
+        })
+    with open(output_path, 'w') as f:
+        json.dump({'traceEvents': trace_events}, f, default=str)
+    print(f"Chrome trace written to {output_path}")
@@ -1,13 +1,15 @@
 import json
 import os
 import re
-import subprocess
-import tempfile
-import markdown
-import pdfkit
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
+from .latex_build import build_pdf, build_pdfs
+from .latex_check import LatexCheckError, normalize_latex
+from .llm_cache import get_llm_cache
+from .llm_pool import RateLimitCallbackHandler, get_pooled_llm, get_rate_limiter
+from .md_pdf import convert_md_to_pdfs
+from .page_fit import fit_resume_to_pages, pdf_page_count
+from .routing import create_routed_llm
+from .structured_resume import load_structured_resume, render_resume_latex
+from .tracing import TraceCallbackHandler, get_tracer
 
 def load_config(config_path):
     with open(config_path, 'r') as config_file:
@@ -24,23 +26,69 @@ def load_config(config_path):
     return config
 
 def get_llm(config, llm_config):
+    if 'candidates' in llm_config:
+        # Routing mode: ordered (service, model) candidates with timeouts, hedging and fallback
+        return create_routed_llm(llm_config, lambda candidate: get_llm(config, candidate))
+
     service = llm_config['service']
     model = llm_config['model']
+    # Shared exact-match response cache, or None when llm_cache is disabled
+    cache = get_llm_cache(config)
+    callbacks = []
+    # Per-provider rate limits shared by every agent and job in the process, taken
+    # through the model's rate_limiter so cache hits skip them
+    limiter = get_rate_limiter(config, service)
+    rate_limiter = None
+    if limiter:
+        rate_limit_handler = RateLimitCallbackHandler(limiter)
+        callbacks.append(rate_limit_handler)
+        rate_limiter = rate_limit_handler.rate_limiter
+    # Per-call timing, token and cost tracing when tracing is enabled
+    if get_tracer():
+        callbacks.append(TraceCallbackHandler(service, model))
+
+    if service == 'fake':
+        # Offline stand-in for benchmarks: replies with canned responses after a fixed latency
+        from langchain_core.language_models.fake_chat_models import FakeListChatModel
+        return FakeListChatModel(
+            responses=llm_config.get('responses', ["Thought: I now know the final answer\nFinal Answer: Done."]),
+            sleep=llm_config.get('latency', 0),
+            cache=cache,
+            callbacks=callbacks or None,
+            rate_limiter=rate_limiter,
+        )
 
+    # One client per (service, model) is shared through copies, so agents reuse its
+    # HTTP connections while keeping their own callbacks and cache
+    max_retries = config.get('llm_max_retries', 2)
+    base_llm = get_pooled_llm(
+        (service, model, max_retries),
+        lambda: create_llm(service, model, max_retries)
+    )
+    return base_llm.model_copy(update={'cache': cache, 'callbacks': callbacks or None, 'rate_limiter': rate_limiter})
+
+def create_llm(service, model, max_retries=2):
+    # Provider SDKs are imported on first use so only the configured ones are loaded
     if service == 'openai':
+        from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             model=model,
             temperature=0.7,
+            max_retries=max_retries,
         )
     elif service == 'anthropic':
+        from langchain_anthropic import ChatAnthropic
         return ChatAnthropic(
             model=model,
             temperature=0.7,
+            max_retries=max_retries,
         )
     elif service == 'google':
+        from langchain_google_genai import ChatGoogleGenerativeAI
         return ChatGoogleGenerativeAI(
             model=model,
             temperature=0.7,
+            max_retries=max_retries,
         )
     else:
         raise ValueError(f"Unsupported LLM service: {service}")
@@ -48,36 +96,20 @@ def get_llm(config, llm_config):
 def print_llm_assignments(config):
     print("LLM assignments:")
     for agent, llm_config in config['agent_llms'].items():
-        print(f"{agent.replace('_', ' ').title()}: {llm_config['service']} - {llm_config['model']}")
-
-import re
-
-def post_process_latex(content):
-    # Remove [[ and ]] tags
-    content = re.sub(r'\[\[.*?\]\]', '', content)
-    
-    # Replace [ with { and ] with } for LaTeX commands
-    content = re.sub(r'\\(\w+)\[', r'\\\1{', content)
-    content = content.replace(']', '}')
-
-    # Replace the lines before \name with the provided lines
-    replacement_text = r"""\documentclass{resume} 
-        \usepackage{enumitem}
-        \setlist{topsep=-3pt, itemsep=-3pt}
-        \usepackage[left=0.45in ,top=0.4in, right=0.45in ,bottom=0.4in]{geometry} 
-
-        \newcommand{\tab}[1]{\hspace{.2667\textwidth}\rlap{#1}} 
-        \newcommand{\MYhref}[3][blue]{\href{#2}{\color{#1}{#3}}}
-        \newcommand{\itab}[1]{\hspace{0em}\rlap{#1}}
-        """
+        candidates = llm_config.get('candidates', [llm_config])
+        models = ' -> '.join(f"{candidate['service']} - {candidate['model']}" for candidate in candidates)
+        print(f"{agent.replace('_', ' ').title()}: {models}")
 
-    content = re.sub(r'^.*?(?=\\name)', replacement_text, content, flags=re.DOTALL)
-    
-
-    
+def post_process_latex(content, first_line=1):
+    """
+    Checks and repairs the LLM's LaTeX (see normalize_latex) and prints each repair.
+    Raises LatexCheckError if the document can't be repaired.
+    """
+    content, fixes = normalize_latex(content, first_line)
+    for fix in fixes:
+        print(f"Fixed LaTeX at {fix}")
     return content
 
-
 def convert_ltx_to_pdf(md_file, cls_file, output_pdf_name="output.pdf"):
     """
     Converts a Markdown file containing LaTeX content within ```latex ``` tags into a PDF.
@@ -100,76 +132,97 @@ def convert_ltx_to_pdf(md_file, cls_file, output_pdf_name="output.pdf"):
         # Regex to extract content between ```latex and ```
         match = re.search(r"```latex(.*?)```", content, re.DOTALL)
         if match:
-            return match.group(1).strip()
+            block = match.group(1)
+            # Line of the Markdown file where the stripped LaTeX starts, for error locations
+            first_line = content.count('\n', 0, match.start(1)) + block[:len(block) - len(block.lstrip())].count('\n') + 1
+            return block.strip(), first_line
         else:
             print("No LaTeX content found in the Markdown file.")
-            return None
+            return None, 1
 
     # Extract the LaTeX content
-    latex_content = extract_latex_from_md(md_file)
+    latex_content, first_line = extract_latex_from_md(md_file)
     if not latex_content:
         print("Failed to extract LaTeX content. Aborting.")
         return
 
-    # Step 2: Post-process the LaTeX content
-    latex_content = post_process_latex(latex_content)
-
+    # Step 2: Check and repair the LaTeX content, skipping the compile if it can't be fixed
     try:
-        # Step 3: Create a temporary directory to store the LaTeX and .cls files
-        with tempfile.TemporaryDirectory() as tempdir:
-            # Paths for the LaTeX and class file
-            latex_file_path = os.path.join(tempdir, "document.tex")
-            class_file_name = os.path.basename(cls_file)
-            class_file_dest_path = os.path.join(tempdir, class_file_name)
-
-            # Write the post-processed LaTeX content to a temporary .tex file
-            with open(latex_file_path, "w") as latex_file:
-                latex_file.write(latex_content)
-
-            # Copy the .cls file to the temporary directory
-            with open(cls_file, "r") as class_file:
-                with open(class_file_dest_path, "w") as dest_file:
-                    dest_file.write(class_file.read())
-
-            # Step 4: Compile the LaTeX file using pdflatex
-            print("Compiling LaTeX file...")
-            subprocess.run(
-                ['pdflatex', '-interaction=nonstopmode', '-output-directory', tempdir, latex_file_path],
-                check=True
-            )
-
-            # Step 5: Move the generated PDF to the current directory
-            pdf_file_path = os.path.join(tempdir, "document.pdf")
-            if os.path.isfile(pdf_file_path):
-                final_output_path = os.path.join(os.getcwd(), output_pdf_name)
-                with open(pdf_file_path, "rb") as pdf_file:
-                    with open(final_output_path, "wb") as output_pdf_file:
-                        output_pdf_file.write(pdf_file.read())
-                print(f"PDF generated successfully: {final_output_path}")
-            else:
-                print("Failed to generate PDF.")
-
-    except subprocess.CalledProcessError as e:
-        print(f"Error during LaTeX compilation: {e}")
-
-def convert_md_to_pdf(md_files):
-    for md_file in md_files:
-        # Check if the file exists
-        if not os.path.exists(md_file):
-            print(f"The file '{md_file}' does not exist. Skipping...")
-            continue
-        
-        # Generate the PDF file name by replacing the .md extension with .pdf
-        pdf_file = os.path.splitext(md_file)[0] + '.pdf'
-        
-        # Read the Markdown file
-        with open(md_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
-
-        # Convert Markdown to HTML
-        html_content = markdown.markdown(md_content)
-
-        # Convert HTML to PDF
-        pdfkit.from_string(html_content, pdf_file)
-
-        print(f"Markdown file '{md_file}' has been converted to '{pdf_file}'.")
\ No newline at end of file
+        latex_content = post_process_latex(latex_content, first_line)
+    except LatexCheckError as e:
+        print(f"Not compiling {md_file}, its LaTeX has problems that can't be repaired:")
+        for problem in e.problems:
+            print(f"  {problem}")
+        return
+
+    pdf_path = compile_latex(latex_content, cls_file, output_pdf_name)
+    # Free-form LaTeX can't be trimmed locally, so only report an overflow
+    if pdf_path and pdf_page_count(pdf_path) > 1:
+        print(f"Warning: {pdf_path} is longer than one page. Enable structured_resume to fit it automatically.")
+    return pdf_path
+
+def convert_json_to_pdf(json_file, cls_file, output_pdf_name="output.pdf", max_pages=1):
+    """
+    Renders the structured resume JSON produced by the emphasis task into the LaTeX
+    template locally and compiles it into a PDF. No LaTeX post-processing is needed
+    since the template and escaping are deterministic. If the PDF runs over max_pages,
+    the resume is trimmed and recompiled locally until it fits.
+
+    Args:
+    - json_file: Path to the structured resume JSON (e.g. latex_resume.json).
+    - cls_file: Path to the .cls file that will be used to format the LaTeX document.
+    - output_pdf_name: The name of the output PDF file (default: "output.pdf").
+    - max_pages: Page limit for the resume, or None to skip fitting (default: 1).
+    """
+    resume = load_structured_resume(json_file)
+    if max_pages is None:
+        return compile_latex(render_resume_latex(resume), cls_file, output_pdf_name)
+
+    return fit_resume_to_pages(
+        resume,
+        lambda latex_content: compile_latex(latex_content, cls_file, output_pdf_name),
+        max_pages=max_pages
+    )
+
+def compile_latex(latex_content, cls_file, output_pdf_name="output.pdf"):
+    """
+    Compiles LaTeX source into a PDF using pdflatex and the given .cls file.
+    Unchanged documents are served from the build cache and the preamble is
+    precompiled into a reusable format (see crew/latex_build.py).
+
+    Returns the path of the generated PDF, or None if compilation failed.
+    """
+    final_output_path = os.path.join(os.getcwd(), output_pdf_name)
+    if build_pdf(latex_content, cls_file, final_output_path):
+        return final_output_path
+    print("Failed to generate PDF.")
+    return None
+
+def compile_latex_many(builds, cls_file, max_workers=4):
+    """
+    Compiles many LaTeX documents concurrently with a bounded worker pool.
+
+    Args:
+    - builds: List of (latex_content, output_pdf_name) pairs.
+    - cls_file: Path to the .cls file shared by all documents.
+    - max_workers: Maximum number of pdflatex processes running at once.
+
+    Returns a list of (output_path, success) pairs.
+    """
+    builds = [(latex_content, os.path.join(os.getcwd(), name)) for latex_content, name in builds]
+    return build_pdfs(builds, cls_file, max_workers=max_workers)
+
+def convert_md_to_pdf(md_files, max_workers=4, stylesheet_file=None):
+    """
+    Converts Markdown files to PDFs next to them and prints the outcome of each.
+    Returns the per-file results of convert_md_to_pdfs.
+    """
+    results = convert_md_to_pdfs(md_files, max_workers=max_workers, stylesheet_file=stylesheet_file)
+    for result in results:
+        if result['status'] == 'missing':
+            print(f"The file '{result['input']}' does not exist. Skipping...")
+        elif result['status'] == 'failed':
+            print(f"Could not convert '{result['input']}': {result['error']}")
+        else:
+            print(f"Markdown file '{result['input']}' has been converted to '{result['output']}'.")
+    return results
\ No newline at end of file
@@ -1,50 +1,187 @@
 import argparse
-from crewai import Crew
+import copy
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from crew.agent_memory import attach_agent_memory
 from crew.agents import create_agents
+from crew.md_pdf import convert_md_to_pdfs
+from crew.posting_dedup import posting_text, print_dedup_summary, reuse_job_analysis
+from crew.scheduler import copy_agents, run_crew
+from crew.stores import text_hash
 from crew.tasks import create_tasks
+from crew.tracing import configure_tracing, export_chrome_trace, print_trace_summary
 from crew.utils import load_config, print_llm_assignments
 
-def run_job_application_process(resume_path, config_path):
-    # Load configuration
-    config = load_config(config_path)
-
-    # Create agents
-    job_analyzer, relevance_selector, emphasis_strategist, cover_letter_writer = create_agents(resume_path, config)
+def run_job(resume_path, config, job_posting_url='', job_description='', output_dir=None, agents=None):
+    # Create agents, unless the caller keeps a warm set for this resume and config
+    job_analyzer, relevance_selector, emphasis_strategist, cover_letter_writer = agents or create_agents(resume_path, config)
 
     # Create tasks
     job_analysis_task, relevance_task, emphasis_task, cover_letter_task = create_tasks(
-        job_analyzer, relevance_selector, emphasis_strategist, cover_letter_writer
-    )
-
-    # Create and run the crew
-    job_application_crew = Crew(
-        agents=[job_analyzer, relevance_selector, emphasis_strategist, cover_letter_writer],
-        tasks=[job_analysis_task, relevance_task, emphasis_task, cover_letter_task],
-        verbose=True
+        job_analyzer, relevance_selector, emphasis_strategist, cover_letter_writer,
+        output_dir=output_dir, structured_resume=config.get('structured_resume', False)
     )
 
     # Prepare inputs for the crew
     job_application_inputs = {
-        'job_posting_url': config.get('job_posting_url', ''),
+        'job_posting_url': job_posting_url,
         'super_resume_path': resume_path,
-        'job_description': config.get('job_description', '')
+        'job_description': job_description
     }
 
-    # Run the crew
-    result = job_application_crew.kickoff(inputs=job_application_inputs)
+    # The posting's content identifies it for duplicate detection and checkpoints
+    job_analysis = None
+    posting_hash = None
+    if config.get('posting_dedup', {}).get('enabled', False) or config.get('checkpoints', {}).get('enabled', False):
+        text = posting_text(config, job_posting_url, job_description)
+        posting_hash = text_hash(text) if text else None
+
+        # Skip the job analysis when a near-duplicate posting was analyzed before
+        job_analysis = reuse_job_analysis(config, job_analysis_task, text, job_posting_url)
+
+    # Save finished task outputs to the candidate's memory for later runs
+    attach_agent_memory(config, resume_path, {
+        'job_analyzer': job_analysis_task,
+        'relevance_selector': relevance_task,
+        'emphasis_strategist': emphasis_task,
+        'cover_letter_writer': cover_letter_task
+    })
+
+    # Run the crew, with independent tasks running concurrently
+    result = run_crew(
+        [job_analyzer, relevance_selector, emphasis_strategist, cover_letter_writer],
+        [job_analysis_task, relevance_task, emphasis_task, cover_letter_task],
+        job_application_inputs,
+        config,
+        task_names=['job_analysis', 'relevance', 'emphasis', 'cover_letter'],
+        reuse={0: job_analysis} if job_analysis else None,
+        posting_hash=posting_hash
+    )
     return result
 
+def run_job_application_process(resume_path, config_path):
+    # Load configuration
+    config = load_config(config_path)
+    configure_tracing(config)
+
+    return run_job(
+        resume_path,
+        config,
+        job_posting_url=config.get('job_posting_url', ''),
+        job_description=config.get('job_description', '')
+    )
+
+def load_manifest(manifest_path):
+    """
+    Reads a batch manifest with one job per row.
+
+    Supports JSONL (one object per line) and CSV (with a header row). Each row needs a
+    `url` and/or `description`; `output_dir` defaults to `output/job_<n>`.
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        if manifest_path.endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    jobs = []
+    for index, row in enumerate(rows, start=1):
+        jobs.append({
+            'url': (row.get('url') or '').strip(),
+            'description': (row.get('description') or '').strip(),
+            'output_dir': (row.get('output_dir') or '').strip() or os.path.join('output', f'job_{index}')
+        })
+    return jobs
+
+def run_batch(resume_path, config_path, manifest_path, concurrency=4):
+    """
+    Runs the job application process for every posting in the manifest.
+
+    Config is loaded and the agents are built once, and the crews are fanned out over a
+    bounded thread pool. Each job runs on its own copies of the agents and writes its
+    files into its own output directory.
+    Returns a list of per-job summaries (status, wall time, error).
+    """
+    config = load_config(config_path)
+    configure_tracing(config)
+    jobs = load_manifest(manifest_path)
+    agents = create_agents(resume_path, config)
+
+    def run_one(job):
+        os.makedirs(job['output_dir'], exist_ok=True)
+        job_config = copy.deepcopy(config)
+        job_config['job_posting_url'] = job['url']
+        job_config['job_description'] = job['description']
+
+        start = time.perf_counter()
+        summary = {'url': job['url'], 'output_dir': job['output_dir'], 'status': 'ok', 'error': None}
+        try:
+            result = run_job(
+                resume_path, job_config, job['url'], job['description'], output_dir=job['output_dir'],
+                agents=list(copy_agents(agents).values())
+            )
+            with open(os.path.join(job['output_dir'], 'result.txt'), 'w', encoding='utf-8') as f:
+                f.write(str(result))
+        except Exception as e:
+            summary['status'] = 'failed'
+            summary['error'] = str(e)
+        summary['wall_time'] = time.perf_counter() - start
+        return summary
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return list(executor.map(run_one, jobs))
+
+def print_batch_summary(summaries, total_time):
+    print("\nBatch Summary:")
+    print(f"{'Status':<8} {'Time (s)':>9}  Output")
+    for summary in summaries:
+        print(f"{summary['status']:<8} {summary['wall_time']:>9.1f}  {summary['output_dir']}")
+        if summary['error']:
+            print(f"{'':<8} {'':>9}  Error: {summary['error']}")
+    succeeded = sum(1 for summary in summaries if summary['status'] == 'ok')
+    print(f"\n{succeeded}/{len(summaries)} jobs succeeded in {total_time:.1f}s")
+
+def print_pdf_summary(results, total_time):
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+        if result['error']:
+            print(f"Could not convert '{result['input']}': {result['error']}")
+    print(f"Converted {len(results)} cover letters to PDF in {total_time:.1f}s: " + ', '.join(f"{count} {status}" for status, count in sorted(counts.items())))
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run job application process")
     parser.add_argument("resume_path", help="Path to the resume file")
     parser.add_argument("config_path", help="Path to the config file")
+    parser.add_argument("--manifest", help="JSONL or CSV manifest of jobs (url, description, output_dir) to run in batch")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum number of jobs to run at once in batch mode")
+    parser.add_argument("--pdf", action="store_true", help="In batch mode, also convert each job's cover letter to PDF")
+    parser.add_argument("--chrome-trace", help="Also export the trace in Chrome trace-event format to this path (requires tracing.enabled)")
     args = parser.parse_args()
 
     print("Starting job application process...")
     print_llm_assignments(load_config(args.config_path))
-    
-    result = run_job_application_process(args.resume_path, args.config_path)
-    
-    print("\nJob Application Process Completed")
-    print("\nResults:")
-    print(result)
+
+    if args.manifest:
+        start = time.perf_counter()
+        summaries = run_batch(args.resume_path, args.config_path, args.manifest, concurrency=args.concurrency)
+        print_batch_summary(summaries, time.perf_counter() - start)
+        print_dedup_summary(load_config(args.config_path))
+
+        if args.pdf:
+            start = time.perf_counter()
+            cover_letters = [os.path.join(summary['output_dir'], 'cover_letter.md') for summary in summaries if summary['status'] == 'ok']
+            print_pdf_summary(convert_md_to_pdfs(cover_letters, max_workers=args.concurrency), time.perf_counter() - start)
+    else:
+        result = run_job_application_process(args.resume_path, args.config_path)
+
+        print("\nJob Application Process Completed")
+        print("\nResults:")
+        print(result)
+
+    print_trace_summary()
+    if args.chrome_trace:
+        export_chrome_trace(args.chrome_trace)
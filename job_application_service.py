@@ -0,0 +1,244 @@
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from crew.agents import create_agents
+from crew.scheduler import copy_agents
+from crew.tracing import configure_tracing
+from crew.utils import load_config, print_llm_assignments
+from job_application_client import run_job
+
+# Trace events kept in memory by the service; older ones are only in the JSONL trace
+SERVICE_MAX_TRACE_EVENTS = 10000
+
+class JobStore:
+    """
+    SQLite-backed job state, so queued and finished jobs survive service restarts.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, url TEXT, description TEXT, status TEXT, output_dir TEXT, "
+            "error TEXT, created_at REAL, started_at REAL, finished_at REAL)"
+        )
+        self._conn.commit()
+
+    def add(self, url, description, output_dir_root):
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, url, description, status, output_dir, created_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, url, description, os.path.join(output_dir_root, job_id), time.time())
+            )
+            self._conn.commit()
+        return self.get(job_id)
+
+    def update(self, job_id, **fields):
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, limit=100):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def unfinished(self):
+        """
+        Returns jobs that were queued or running when the service last stopped, oldest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+class JobApplicationService:
+    """
+    Local HTTP service that keeps config, tools and LLM clients warm between jobs.
+
+    Endpoints:
+    - POST /jobs with {"url": ..., "description": ...} queues a job (503 when the queue is full)
+    - GET /jobs and GET /jobs/<id> return job status
+    - GET /jobs/<id>/artifacts lists output files, GET /jobs/<id>/artifacts/<name> downloads one
+    - GET /health
+    """
+
+    def __init__(self, resume_path, config, data_dir, workers=2, queue_size=100):
+        self.resume_path = resume_path
+        self.config = config
+        self.data_dir = data_dir
+        self.workers = workers
+        self.store = JobStore(os.path.join(data_dir, 'jobs.sqlite'))
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.agents = None
+
+    def warm_up(self):
+        # Builds the agents with their resume index, web tools and pooled LLM clients once;
+        # every job runs with its own copies of them
+        print("Warming up agents and tools...")
+        self.agents = create_agents(self.resume_path, self.config)
+
+    def job_agents(self):
+        if self.agents is None:
+            self.warm_up()
+        return list(copy_agents(self.agents).values())
+
+    async def worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job_id = await self.queue.get()
+            job = self.store.get(job_id)
+            self.store.update(job_id, status='running', started_at=time.time())
+            try:
+                os.makedirs(job['output_dir'], exist_ok=True)
+                result = await loop.run_in_executor(
+                    self.executor, run_job,
+                    self.resume_path, self.config, job['url'], job['description'], job['output_dir'],
+                    self.job_agents()
+                )
+                with open(os.path.join(job['output_dir'], 'result.txt'), 'w', encoding='utf-8') as f:
+                    f.write(str(result))
+                self.store.update(job_id, status='succeeded', finished_at=time.time())
+            except Exception as e:
+                self.store.update(job_id, status='failed', error=str(e), finished_at=time.time())
+            finally:
+                self.queue.task_done()
+
+    def submit(self, url, description):
+        if self.queue.full():
+            return None
+        job = self.store.add(url, description, os.path.join(self.data_dir, 'jobs'))
+        self.queue.put_nowait(job['id'])
+        return job
+
+    def route(self, method, path, body):
+        parts = [part for part in path.split('?')[0].split('/') if part]
+
+        if method == 'GET' and parts == ['health']:
+            return 200, {'status': 'ok', 'queued': self.queue.qsize()}
+
+        if method == 'POST' and parts == ['jobs']:
+            try:
+                payload = json.loads(body or b'{}')
+            except json.JSONDecodeError:
+                return 400, {'error': 'Request body must be JSON'}
+            if not payload.get('url') and not payload.get('description'):
+                return 400, {'error': 'A url or description is required'}
+            job = self.submit(payload.get('url', ''), payload.get('description', ''))
+            if job is None:
+                return 503, {'error': 'Job queue is full, retry later'}
+            return 202, job
+
+        if method == 'GET' and parts == ['jobs']:
+            return 200, self.store.list()
+
+        if method == 'GET' and len(parts) >= 2 and parts[0] == 'jobs':
+            job = self.store.get(parts[1])
+            if job is None:
+                return 404, {'error': 'Unknown job'}
+            if len(parts) == 2:
+                return 200, job
+            if parts[2] == 'artifacts':
+                if not os.path.isdir(job['output_dir']):
+                    return (200, []) if len(parts) == 3 else (404, {'error': 'Unknown artifact'})
+                if len(parts) == 3:
+                    return 200, sorted(os.listdir(job['output_dir']))
+                name = parts[3]
+                artifact_path = os.path.join(job['output_dir'], name)
+                if len(parts) == 4 and name in os.listdir(job['output_dir']) and os.path.isfile(artifact_path):
+                    with open(artifact_path, 'rb') as f:
+                        return 200, f.read()
+
+        return 404, {'error': 'Not found'}
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            if not request_line:
+                return
+            method, path, _ = request_line.split(' ', 2)
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+            status, payload = self.route(method, path, body)
+            if isinstance(payload, bytes):
+                content, content_type = payload, 'application/octet-stream'
+            else:
+                content, content_type = json.dumps(payload, indent=2).encode('utf-8'), 'application/json'
+            reasons = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 503: 'Service Unavailable'}
+            writer.write(
+                f"HTTP/1.1 {status} {reasons.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\nContent-Length: {len(content)}\r\nConnection: close\r\n\r\n".encode('latin-1')
+                + content
+            )
+            await writer.drain()
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def requeue_unfinished(self):
+        # Jobs interrupted by a restart are queued again, oldest first, waiting for
+        # queue space rather than dropping any
+        for job in self.store.unfinished():
+            self.store.update(job['id'], status='queued')
+            await self.queue.put(job['id'])
+
+    async def serve(self, host, port):
+        workers = [asyncio.create_task(self.worker()) for _ in range(self.workers)]
+        requeue = asyncio.create_task(self.requeue_unfinished())
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Serving on http://{host}:{port} with {self.workers} workers")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            requeue.cancel()
+            for worker in workers:
+                worker.cancel()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the job application process as a local HTTP service")
+    parser.add_argument("resume_path", help="Path to the resume file")
+    parser.add_argument("config_path", help="Path to the config file")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=2, help="Number of jobs to run at once")
+    parser.add_argument("--queue-size", type=int, default=100, help="Maximum number of queued jobs")
+    parser.add_argument("--data-dir", default=os.path.join(".cache", "service"), help="Where job state and outputs are stored")
+    args = parser.parse_args()
+
+    config = load_config(args.config_path)
+    configure_tracing(config, max_events=SERVICE_MAX_TRACE_EVENTS)
+    print_llm_assignments(config)
+
+    async def main():
+        service = JobApplicationService(args.resume_path, config, args.data_dir, args.workers, args.queue_size)
+        service.warm_up()
+        await service.serve(args.host, args.port)
+
+    asyncio.run(main())
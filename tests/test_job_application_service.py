@@ -0,0 +1,148 @@
+"""
+Tests for the job application service. Jobs run the full pipeline offline with the
+'fake' LLM and embedding services, so no provider is called.
+
+    python -m pytest tests
+"""
+import asyncio
+import json
+import os
+import sys
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import job_application_client
+from crew.tracing import Tracer
+from job_application_service import JobApplicationService
+
+SAMPLE_RESUME = os.path.join(REPO_ROOT, 'benchmarks', 'sample_resume.md')
+POSTING = "Senior Backend Engineer. Requirements: 5+ years of Python, Kafka, Kubernetes and PostgreSQL."
+
+def fake_llm(answer):
+    return {"service": "fake", "model": "fake", "responses": [f"Thought: I now know the final answer\nFinal Answer: {answer}"]}
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    # Caches and indexes default to .cache under the working directory
+    monkeypatch.chdir(tmp_path)
+    return {
+        "api_keys": {"serper": "test"},
+        "agent_llms": {
+            "job_analyzer": fake_llm("- Python\n- Kafka\n- Kubernetes"),
+            "relevance_selector": fake_llm("# Jane Doe\n\n## Experience\n\n- Built **Kafka** pipelines"),
+            "emphasis_strategist": fake_llm("\\documentclass{resume}"),
+            "cover_letter_writer": fake_llm("Dear Hiring Manager,\n\nI am excited to apply."),
+        },
+        "resume_index": {"enabled": True, "dir": str(tmp_path / "resume_index"),
+                         "embedding": {"service": "fake", "model": "64"}},
+        "tool_cache": {"enabled": False},
+        "tracing": {"enabled": False},
+    }
+
+def create_service(config, data_dir, queue_size=100):
+    service = JobApplicationService(SAMPLE_RESUME, config, str(data_dir), workers=1, queue_size=queue_size)
+    service.warm_up()
+    return service
+
+def run_until_idle(service, requeue=False):
+    """
+    Runs the service's workers until every queued job has finished.
+    """
+    async def main():
+        workers = [asyncio.create_task(service.worker()) for _ in range(service.workers)]
+        if requeue:
+            await service.requeue_unfinished()
+        await service.queue.join()
+        for worker in workers:
+            worker.cancel()
+
+    asyncio.run(main())
+
+def submit(service, payload):
+    return service.route('POST', '/jobs', json.dumps(payload).encode('utf-8'))
+
+def test_submit_status_and_artifacts(config, tmp_path):
+    service = create_service(config, tmp_path / "service")
+
+    status, job = submit(service, {"description": POSTING})
+    assert status == 202
+    assert job['status'] == 'queued'
+
+    run_until_idle(service)
+
+    status, job = service.route('GET', f"/jobs/{job['id']}", b'')
+    assert status == 200
+    assert job['status'] == 'succeeded', job['error']
+
+    status, artifacts = service.route('GET', f"/jobs/{job['id']}/artifacts", b'')
+    assert status == 200
+    assert 'cover_letter.md' in artifacts
+    assert 'result.txt' in artifacts
+
+    status, content = service.route('GET', f"/jobs/{job['id']}/artifacts/cover_letter.md", b'')
+    assert status == 200
+    assert b'Dear Hiring Manager' in content
+
+    status, _ = service.route('GET', f"/jobs/{job['id']}/artifacts/../jobs.sqlite", b'')
+    assert status == 404
+
+def test_jobs_reuse_warm_agents(config, tmp_path, monkeypatch):
+    service = create_service(config, tmp_path / "service")
+
+    def create_agents(*args, **kwargs):
+        raise AssertionError("jobs should run with the service's warm agents")
+
+    monkeypatch.setattr(job_application_client, 'create_agents', create_agents)
+    jobs = [submit(service, {"description": POSTING})[1] for _ in range(2)]
+    run_until_idle(service)
+
+    for job in jobs:
+        assert service.store.get(job['id'])['status'] == 'succeeded'
+
+def test_rejected_requests(config, tmp_path):
+    service = create_service(config, tmp_path / "service", queue_size=1)
+
+    assert submit(service, {})[0] == 400
+    assert service.route('POST', '/jobs', b'not json')[0] == 400
+    assert service.route('GET', '/jobs/unknown', b'')[0] == 404
+
+    assert submit(service, {"description": POSTING})[0] == 202
+    assert submit(service, {"description": POSTING})[0] == 503
+
+def test_restart_requeues_unfinished_jobs(config, tmp_path):
+    data_dir = tmp_path / "service"
+    service = create_service(config, data_dir)
+    queued = service.store.add('', POSTING, str(data_dir / "jobs"))
+    running = service.store.add('', POSTING, str(data_dir / "jobs"))
+    # The service stopped with one job still queued and one mid-run
+    service.store.update(running['id'], status='running')
+
+    restarted = create_service(config, data_dir)
+    run_until_idle(restarted, requeue=True)
+
+    for job in (queued, running):
+        job = restarted.store.get(job['id'])
+        assert job['status'] == 'succeeded', job['error']
+        assert os.path.isfile(os.path.join(job['output_dir'], 'result.txt'))
+
+def test_tracer_keeps_most_recent_events(tmp_path):
+    tracer = Tracer(str(tmp_path / "trace.jsonl"), max_events=2)
+    for i in range(3):
+        tracer.emit(f"event_{i}", 'test', 0, 0)
+
+    assert [event['name'] for event in tracer.events] == ['event_1', 'event_2']
+    tracer.close()
+    with open(tmp_path / "trace.jsonl") as f:
+        assert len(f.readlines()) == 3
+
+def test_tracer_rotates_trace_file(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer(str(path), max_bytes=200)
+    for i in range(10):
+        tracer.emit(f"event_{i}", 'test', 0, 0)
+    tracer.close()
+
+    assert os.path.getsize(path) < 200
+    assert os.path.isfile(str(path) + '.1')